@@ -3,14 +3,23 @@ Multi-Language Voice to Text and Text to Voice Application
 Main application file: app.py
 """
 
+import sys
+
+if __name__ == "__main__" and sys.argv[1:2] == ['--batch']:
+    # Dispatch before pygame and googletrans are imported so nothing reaches stdout
+    import batch
+    sys.exit(batch.main(sys.argv[2:]))
+
 import speech_recognition as sr
-from gtts import gTTS
 from googletrans import Translator
 import os
 import tempfile
 from pathlib import Path
 import pygame
 import time
+from language_id import detect_language
+from translation_memory import TranslationMemory
+from utils import parse_speed, play_audio_file, resolve_speed, save_speech, synthesize_speech
 
 # Initialize pygame mixer for audio playback with error handling
 try:
@@ -29,6 +38,7 @@ translator = Translator()
 class VoiceTranslator:
     def __init__(self):
         self.recognizer = sr.Recognizer()
+        self.memory = TranslationMemory()
         self.supported_languages = {
             'en': 'English',
             'es': 'Spanish',
@@ -52,16 +62,40 @@ class VoiceTranslator:
             print(f"{code}: {name}")
         print()
     
-    def translate_text(self, text, source_language='auto', target_language='en'):
-        """Translate text from source language to target language"""
+    def translate_text(self, text, source_language='auto', target_language='en', raise_errors=False):
+        """Translate text from source language to target language (raise_errors re-raises API failures)"""
         if not text:
             print("❌ No text to translate")
             return None
         
-        # If target is English and source is auto, no translation needed
-        if target_language == 'en' and source_language == 'auto':
+        # Identify the source language locally instead of asking Google
+        if source_language == 'auto':
+            started = time.perf_counter()
+            detected = detect_language(text)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if detected:
+                print(f"\n🔍 Detected language: {self.supported_languages.get(detected, detected)} ({elapsed_ms:.2f} ms)")
+                source_language = detected
+
+        # Text already in the target language needs no translation
+        if source_language == target_language:
+            print(f"\n✓ Text is already in {self.supported_languages.get(target_language, 'Unknown')}, skipping translation")
             return text
-        
+
+        # Reuse a previous translation of the same or a near-identical segment
+        started = time.perf_counter()
+        match = self.memory.lookup(text, source_language, target_language)
+        if match:
+            translated_text, match_type = match
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"\n📚 Translation memory {match_type} hit ({elapsed_ms:.2f} ms)")
+            print(f"   ✓ Translated text: {translated_text}")
+            return translated_text
+
+        suggestion = self.memory.suggest(text, source_language, target_language)
+        if suggestion:
+            print(f"\n💡 Similar earlier segment ({suggestion[2]:.2f}): {suggestion[0]} → {suggestion[1]}")
+
         try:
             source_name = self.supported_languages.get(source_language, 'Auto')
             target_name = self.supported_languages.get(target_language, 'Unknown')
@@ -69,9 +103,11 @@ class VoiceTranslator:
             print(f"   From: {source_name} → To: {target_name}")
             print(f"   Original text: {text}")
             
-            # Use googletrans with correct syntax
-            result = translator.translate(text, dest=target_language)
+            # Use googletrans with correct syntax (it names Chinese 'zh-cn')
+            src = 'zh-cn' if source_language == 'zh' else source_language
+            result = translator.translate(text, src=src, dest=target_language)
             translated_text = result.text
+            self.memory.add(text, translated_text, source_language, target_language)
             
             print(f"   ✓ Translated text: {translated_text}")
             return translated_text
@@ -79,6 +115,8 @@ class VoiceTranslator:
         except Exception as e:
             print(f"❌ Translation error: {e}")
             print("💡 Make sure you have an internet connection for translation.")
+            if raise_errors:
+                raise
             return text
     
     def voice_to_text(self, language='en'):
@@ -109,8 +147,8 @@ class VoiceTranslator:
                 print(f"❌ API error: {e}")
                 return None
     
-    def text_to_voice(self, text, language='en', slow=False):
-        """Convert text to voice and play it"""
+    def text_to_voice(self, text, language='en', slow=False, speed=None):
+        """Convert text to voice and play it (speed overrides slow, e.g. 0.5 or 1.5)"""
         if not text:
             print("❌ No text to convert")
             return
@@ -125,37 +163,28 @@ class VoiceTranslator:
         print(f"\n🔊 Converting to speech...")
         print(f"   Text to speak: {text}")
         print(f"   Target Language: {self.supported_languages.get(language, 'Unknown')} (code: {language})")
-        print(f"   Slow speed: {slow}")
+        speed = resolve_speed(slow, speed)
+        print(f"   Playback speed: {speed}x")
         
         temp_file_path = None
         try:
-            # Create speech with the specified language
+            # Create normal-speed speech; other speeds are stretched locally
             print("   Creating audio file with gTTS...")
-            tts = gTTS(text=text, lang=language, slow=slow)
-            print(f"   ✓ gTTS object created successfully")
+            audio = synthesize_speech(text, language)
+            print(f"   ✓ Speech synthesized successfully")
             
             # Save to temporary file
             temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
             temp_file_path = temp_file.name
+            temp_file.write(audio)
             temp_file.close()
             
-            print(f"   Saving to temp file: {temp_file_path}")
-            tts.save(temp_file_path)
-            print(f"   ✓ Audio file saved successfully")
+            print(f"   ✓ Audio saved to temp file: {temp_file_path}")
             print(f"✓ Playing audio in {self.supported_languages.get(language, 'Unknown')}...")
             
             # Play the audio using pygame
             try:
-                pygame.mixer.music.load(temp_file_path)
-                pygame.mixer.music.play()
-                
-                # Wait for playback to finish
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(10)
-                
-                # Stop playback and unload
-                pygame.mixer.music.stop()
-                pygame.mixer.music.unload()
+                play_audio_file(temp_file_path, speed)
                 
             except pygame.error as pe:
                 print(f"⚠️  Pygame playback failed: {pe}")
@@ -178,8 +207,8 @@ class VoiceTranslator:
             print("💡 Make sure you have an internet connection for text-to-speech conversion.")
             print(f"💡 Ensure language code '{language}' is valid for gTTS.")
     
-    def save_audio_file(self, text, language='en', filename='output.mp3', slow=False):
-        """Save text-to-speech to file"""
+    def save_audio_file(self, text, language='en', filename='output.mp3', slow=False, speed=None):
+        """Save text-to-speech to file and return the path (non-normal speeds are saved as WAV)"""
         if not text:
             print("❌ No text to convert")
             return
@@ -191,13 +220,18 @@ class VoiceTranslator:
         
         try:
             print(f"🔊 Creating audio file with language: {language}")
-            tts = gTTS(text=text, lang=language, slow=slow)
-            tts.save(filename)
+            filename = save_speech(text, language, filename, resolve_speed(slow, speed))
             print(f"✓ Audio saved to: {filename}")
+            return filename
             
         except Exception as e:
             print(f"❌ Error saving file: {e}")
             print("💡 Make sure you have an internet connection and the language code is valid.")
+            return None
+
+def ask_speed(prompt):
+    """Ask for playback speed: 'y' means slow, a number sets the speed factor"""
+    return parse_speed(input(prompt))
 
 def main():
     translator_app = VoiceTranslator()
@@ -214,9 +248,10 @@ def main():
         print("4. Voice to Text to Translate to Voice")
         print("5. Save Text to Audio File (with Translation)")
         print("6. List Supported Languages")
-        print("7. Exit")
+        print("7. Transcribe Recording to Subtitles (with Translation)")
+        print("8. Exit")
         
-        choice = input("\nEnter your choice (1-7): ").strip()
+        choice = input("\nEnter your choice (1-8): ").strip()
         
         if choice == '1':
             translator_app.list_languages()
@@ -230,11 +265,11 @@ def main():
             
             if text:
                 # Translate text to target language
-                translated = translator_app.translate_text(text, source_language='en', target_language=lang)
+                translated = translator_app.translate_text(text, source_language='auto', target_language=lang)
                 
                 if translated:
-                    slow = input("Slow speed? (y/n, default: n): ").strip().lower() == 'y'
-                    translator_app.text_to_voice(translated, language=lang, slow=slow)
+                    speed = ask_speed("Slow speed? (y/n or speed factor like 1.5, default: n): ")
+                    translator_app.text_to_voice(translated, language=lang, speed=speed)
             
         elif choice == '3':
             text = input("Enter text to translate: ").strip()
@@ -261,8 +296,8 @@ def main():
                 if translated:
                     # Text to Voice
                     print(f"\nStep 3: Converting translated text to voice in {translator_app.supported_languages.get(target_lang, 'Unknown')}...")
-                    slow = input("Slow speed for playback? (y/n, default: n): ").strip().lower() == 'y'
-                    translator_app.text_to_voice(translated, language=target_lang, slow=slow)
+                    speed = ask_speed("Slow speed for playback? (y/n or speed factor like 1.5, default: n): ")
+                    translator_app.text_to_voice(translated, language=target_lang, speed=speed)
             
         elif choice == '5':
             translator_app.list_languages()
@@ -271,17 +306,32 @@ def main():
             
             if text:
                 # Translate text to target language
-                translated = translator_app.translate_text(text, source_language='en', target_language=lang)
+                translated = translator_app.translate_text(text, source_language='auto', target_language=lang)
                 
                 if translated:
                     filename = input("Enter filename (default: output.mp3): ").strip() or 'output.mp3'
-                    slow = input("Slow speed? (y/n, default: n): ").strip().lower() == 'y'
-                    translator_app.save_audio_file(translated, language=lang, filename=filename, slow=slow)
+                    speed = ask_speed("Slow speed? (y/n or speed factor like 1.5, default: n): ")
+                    translator_app.save_audio_file(translated, language=lang, filename=filename, speed=speed)
             
         elif choice == '6':
             translator_app.list_languages()
             
         elif choice == '7':
+            from subtitles import SubtitleTranscriber
+            
+            path = input("Enter audio file path (WAV/AIFF): ").strip()
+            if path:
+                translator_app.list_languages()
+                source_lang = input("Enter source language code (default: en): ").strip() or 'en'
+                target_lang = input("Enter target language code (default: es): ").strip() or 'es'
+                subtitle_format = input("Subtitle format (srt/vtt, default: srt): ").strip().lower() or 'srt'
+                workers = input("Number of parallel workers (default: 4): ").strip()
+                transcriber = SubtitleTranscriber(translator_app, workers=int(workers) if workers.isdigit() else None)
+                transcriber.transcribe(path, source_language=source_lang, target_language=target_lang,
+                                       subtitle_format=subtitle_format)
+            
+        elif choice == '8':
+            translator_app.memory.print_stats()
             print("\nThank you for using Voice Translator!")
             break
             
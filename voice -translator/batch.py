@@ -0,0 +1,170 @@
+"""
+Non-interactive batch mode: JSON-lines jobs in, JSON-lines results out
+File: batch.py
+
+Each input line is a job such as:
+    {"id": 1, "action": "translate", "text": "Hello", "source": "auto", "target": "es"}
+    {"id": 2, "action": "tts", "text": "Hola", "target": "es", "output": "hola.mp3"}
+    {"id": 3, "action": "translate+tts", "text": "Good night", "target": "fr", "speed": 0.8}
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+import config
+
+ACTIONS = ('translate', 'tts', 'translate+tts')
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def run_job(translator_app, line, line_number, audio_dir):
+    """Execute one JSON-lines job and return its result record"""
+    started = time.perf_counter()
+    result = {'line': line_number, 'ok': False}
+    try:
+        job = json.loads(line)
+        if not isinstance(job, dict):
+            raise ValueError("job must be a JSON object")
+        if 'id' in job:
+            result['id'] = job['id']
+
+        action = job.get('action', 'translate')
+        result['action'] = action
+        if action not in ACTIONS:
+            raise ValueError(f"unknown action '{action}' (use one of {', '.join(ACTIONS)})")
+
+        text = job.get('text')
+        if not text:
+            raise ValueError("missing 'text'")
+        source = job.get('source', 'auto')
+        target = job.get('target', 'en')
+        speed = job.get('speed')
+        if speed is not None and (isinstance(speed, bool) or not isinstance(speed, (int, float))
+                                  or not 0 < speed < math.inf):
+            raise ValueError(f"'speed' must be a positive number, got {speed!r}")
+        timings = {}
+
+        if action in ('translate', 'translate+tts'):
+            step = time.perf_counter()
+            text = translator_app.translate_text(text, source_language=source, target_language=target,
+                                                 raise_errors=True)
+            timings['translate_ms'] = _elapsed_ms(step)
+            result['translated'] = text
+
+        if action in ('tts', 'translate+tts'):
+            name = re.sub(r"[^\w.-]", '_', str(job.get('id', line_number)))
+            filename = job.get('output') or os.path.join(audio_dir, f"{name}.mp3")
+            step = time.perf_counter()
+            filename = translator_app.save_audio_file(
+                text, language=target, filename=filename, speed=speed
+            )
+            timings['tts_ms'] = _elapsed_ms(step)
+            if not filename:
+                raise RuntimeError("speech synthesis failed")
+            result['audio'] = filename
+
+        result['ok'] = True
+        result['timings'] = timings
+    except Exception as e:
+        result['error'] = str(e)
+
+    result.setdefault('timings', {})['total_ms'] = _elapsed_ms(started)
+    return result
+
+
+def run_batch(lines, out, translator_app, workers=None, ordered=False, audio_dir='audio_files'):
+    """Process jobs from an iterable of lines and write results to out as they complete"""
+    workers = workers or config.BATCH_WORKERS
+    max_pending = workers * config.BATCH_PENDING_PER_WORKER
+    os.makedirs(audio_dir, exist_ok=True)
+
+    stats = {'jobs': 0, 'failed': 0}
+    started = time.perf_counter()
+
+    def emit(future):
+        result = future.result()
+        stats['failed'] += not result['ok']
+        out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        out.flush()
+
+    # Only a bounded window of jobs is in flight, so memory stays flat
+    with ThreadPoolExecutor(workers) as pool:
+        pending = deque() if ordered else set()
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            future = pool.submit(run_job, translator_app, line, line_number, audio_dir)
+            stats['jobs'] += 1
+
+            if ordered:
+                pending.append(future)
+                while pending and (len(pending) >= max_pending or pending[0].done()):
+                    emit(pending.popleft())
+            else:
+                pending.add(future)
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                else:
+                    done = {f for f in pending if f.done()}
+                    pending -= done
+                for f in done:
+                    emit(f)
+
+        if ordered:
+            while pending:
+                emit(pending.popleft())
+        else:
+            for f in as_completed(pending):
+                emit(f)
+
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run translate/tts jobs from JSON lines")
+    parser.add_argument('input', nargs='?', default='-', help="JSON-lines job file (default: stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSON-lines result file (default: stdout)")
+    parser.add_argument('-j', '--workers', type=int, default=config.BATCH_WORKERS,
+                        help=f"number of concurrent jobs (default: {config.BATCH_WORKERS})")
+    parser.add_argument('--ordered', action='store_true', help="emit results in input order")
+    parser.add_argument('--audio-dir', default='audio_files',
+                        help="directory for tts output without an explicit 'output' (default: audio_files)")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        lines = sys.stdin if args.input == '-' else stack.enter_context(
+            open(args.input, encoding='utf-8'))
+        out = sys.stdout if args.output == '-' else stack.enter_context(
+            open(args.output, 'w', encoding='utf-8'))
+
+        # Keep the app's progress messages (and pygame's banner) out of the result stream
+        os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+        stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        from app import VoiceTranslator
+
+        translator_app = VoiceTranslator()
+        stats = run_batch(lines, out, translator_app, workers=args.workers,
+                          ordered=args.ordered, audio_dir=args.audio_dir)
+
+        rate = stats['jobs'] / stats['elapsed'] if stats['elapsed'] else 0.0
+        print(f"✓ {stats['jobs']} jobs ({stats['failed']} failed) in {stats['elapsed']:.1f}s "
+              f"({rate:.1f} jobs/s)")
+        translator_app.memory.print_stats()
+
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
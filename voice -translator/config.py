@@ -0,0 +1,45 @@
+"""
+Configuration settings for Voice Translator
+File: config.py
+"""
+
+# Long recording transcription (subtitles.py)
+SUBTITLE_WORKERS = 4            # Parallel recognition/translation workers
+SUBTITLE_FRAME_MS = 30          # Audio frame size used for silence detection
+SUBTITLE_MIN_SILENCE = 0.5      # Seconds of silence that end a segment
+SUBTITLE_MIN_SEGMENT = 1.0      # Segments shorter than this keep growing
+SUBTITLE_MAX_SEGMENT = 30.0     # Force a split after this many seconds
+SUBTITLE_CALIBRATION = 1.0      # Seconds of audio used to measure ambient noise
+SUBTITLE_SILENCE_RATIO = 1.5    # Energy above ambient level counted as speech
+SUBTITLE_MIN_ENERGY = 300       # Lower bound for the speech energy threshold
+
+# Translation memory (translation_memory.py)
+TM_SIMILARITY_THRESHOLD = 0.85  # Minimum Jaccard similarity for a suggestion
+TM_SHINGLE_SIZE = 3             # Character n-gram size used for similarity
+TM_NUM_PERM = 64                # MinHash signature length
+TM_BANDS = 8                    # LSH bands; candidates from about (1/bands) ** (bands/TM_NUM_PERM) = 0.77 similarity
+TM_MAX_ENTRIES = 100000         # Stop remembering new segments beyond this many
+
+# Text to speech playback (utils.py)
+SLOW_SPEED = 0.75               # Playback speed used for the "slow" option
+TTS_CACHE_SIZE = 32             # Normal-speed synthesized clips kept in memory
+
+# JSON-lines batch mode (batch.py)
+BATCH_WORKERS = 4               # Concurrent jobs
+BATCH_PENDING_PER_WORKER = 4    # In-flight jobs per worker before reading more input
+
+# Speech synthesis backend (tts_backend.py)
+TTS_FETCH_WORKERS = 8           # Text chunks fetched concurrently (and pooled connections)
+TTS_TIMEOUT = 15                # Seconds before a chunk request is abandoned
+
+# Job queue workers (job_queue.py, worker.py)
+QUEUE_VISIBILITY_TIMEOUT = 60   # Seconds before an unacknowledged job is redelivered
+QUEUE_MAX_ATTEMPTS = 3          # Deliveries before a job is marked failed
+QUEUE_RETRY_DELAY = 2           # Seconds before a failed attempt is retried
+QUEUE_POLL_INTERVAL = 0.5       # Seconds an idle worker waits before polling again
+QUEUE_METRICS_WINDOW = 60       # Seconds of history used for throughput metrics
+QUEUE_RETENTION = 3600          # Seconds collected jobs (and their audio) are kept before purging
+
+# Language identification (language_id.py)
+LANGID_TEMPERATURE = 8.0        # Tempering of n-gram log-likelihoods into a confidence
+LANGID_MIN_CONFIDENCE = 0.95    # Below this the language is treated as unknown
@@ -6,13 +6,16 @@ File: gui_app.py (Updated with full language support using free APIs)
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import speech_recognition as sr
-from gtts import gTTS
 import os
 import pygame
 import tempfile
 import threading
+import time
 import requests
 from googletrans import Translator
+from language_id import detect_language
+from translation_memory import TranslationMemory
+from utils import play_audio_file, resolve_speed, save_speech, synthesize_speech
 
 class VoiceTranslatorGUI:
     def __init__(self, root):
@@ -23,6 +26,8 @@ class VoiceTranslatorGUI:
         
         self.recognizer = sr.Recognizer()
         self.is_listening = False
+        self.last_source_language = None
+        self.memory = TranslationMemory()
         
         # Initialize pygame mixer with error handling
         try:
@@ -61,10 +66,26 @@ class VoiceTranslatorGUI:
         if not text or not text.strip():
             return text
         
-        # If target is English, no translation needed
-        if target_lang_code == 'en':
+        # Identify the source language locally
+        started = time.perf_counter()
+        source_lang_code = detect_language(text)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.last_source_language = source_lang_code
+        print(f"Detected language: {source_lang_code or 'unknown'} ({elapsed_ms:.2f} ms)")
+        
+        # If text is already in the target language, no translation needed
+        if source_lang_code == target_lang_code:
             return text
         
+        # Reuse a previous translation of the same or a near-identical segment
+        memory_source = source_lang_code or 'auto'
+        started = time.perf_counter()
+        match = self.memory.lookup(text, memory_source, target_lang_code)
+        if match:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"Translation memory {match[1]} hit ({elapsed_ms:.2f} ms)")
+            return match[0]
+        
         try:
             # Map language codes to language names
             lang_names = {
@@ -88,10 +109,12 @@ class VoiceTranslatorGUI:
             # Use Google Translate
             try:
                 translator = Translator()
-                result = translator.translate(text, dest=target_lang_code)
+                src = {'zh': 'zh-cn'}.get(source_lang_code, source_lang_code or 'auto')
+                result = translator.translate(text, src=src, dest=target_lang_code)
                 translated = result.text
                 
                 if translated and translated.strip():
+                    self.memory.add(text, translated, memory_source, target_lang_code)
                     print(f"Original: {text}")
                     print(f"Translated to {target_name}: {translated}")
                     return translated
@@ -105,6 +128,7 @@ class VoiceTranslatorGUI:
                     from urllib.parse import quote
                     
                     lang_map = {
+                        'en': 'en-US',
                         'es': 'es-ES',
                         'fr': 'fr-FR',
                         'de': 'de-DE',
@@ -119,9 +143,11 @@ class VoiceTranslatorGUI:
                         'ko': 'ko-KR'
                     }
                     
+                    # MyMemory needs an explicit source; assume English if undetected
+                    source = lang_map.get(source_lang_code or 'en', source_lang_code)
                     target = lang_map.get(target_lang_code, target_lang_code)
                     encoded_text = quote(text)
-                    url = f"https://api.mymemory.translated.net/get?q={encoded_text}&langpair=en|{target}"
+                    url = f"https://api.mymemory.translated.net/get?q={encoded_text}&langpair={source}|{target}"
                     
                     response = requests.get(url, timeout=10)
                     data = response.json()
@@ -129,6 +155,7 @@ class VoiceTranslatorGUI:
                     if data.get('responseStatus') == 200:
                         translated = data['responseData']['translatedText']
                         if translated and translated != text:
+                            self.memory.add(text, translated, memory_source, target_lang_code)
                             print(f"Original: {text}")
                             print(f"Translated to {target_name} (via MyMemory): {translated}")
                             return translated
@@ -354,7 +381,7 @@ class VoiceTranslatorGUI:
     
     def _speak_text_thread(self, text):
         lang_code = self.languages[self.language_var.get()]
-        slow = self.slow_var.get()
+        speed = resolve_speed(self.slow_var.get())
         
         try:
             # Validate text is not empty
@@ -369,7 +396,7 @@ class VoiceTranslatorGUI:
             translated_text = self.translate_text(text, lang_code)
             
             # Verify translation actually happened
-            if translated_text == text and lang_code != 'en':
+            if translated_text == text and self.last_source_language != lang_code:
                 messagebox.showwarning("Translation Warning", 
                     f"Text may not have translated properly to {self.language_var.get()}.\n"
                     f"Original: {text[:50]}...")
@@ -377,23 +404,17 @@ class VoiceTranslatorGUI:
             self.status_var.set("Converting to speech...")
             
             # Convert translated text to speech in target language
-            tts = gTTS(text=translated_text, lang=lang_code, slow=slow)
+            audio = synthesize_speech(translated_text, lang_code)
             temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+            temp_file.write(audio)
             temp_file.close()
             
-            tts.save(temp_file.name)
             self.status_var.set("Playing audio...")
             
-            # Play audio using pygame
-            pygame.mixer.music.load(temp_file.name)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to finish
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
+            # Play audio using pygame (slow speed is stretched locally)
+            play_audio_file(temp_file.name, speed)
             
             # Clean up
-            pygame.mixer.music.unload()
             os.unlink(temp_file.name)
             self.status_var.set("Playback complete!")
             
@@ -420,7 +441,7 @@ class VoiceTranslatorGUI:
             return
         
         lang_code = self.languages[self.language_var.get()]
-        slow = self.slow_var.get()
+        speed = resolve_speed(self.slow_var.get())
         
         try:
             self.status_var.set("Translating and saving audio file...")
@@ -429,8 +450,7 @@ class VoiceTranslatorGUI:
             translated_text = self.translate_text(text, lang_code)
             
             # Convert translated text to speech in target language
-            tts = gTTS(text=translated_text, lang=lang_code, slow=slow)
-            tts.save(filename)
+            filename = save_speech(translated_text, lang_code, filename, speed)
             messagebox.showinfo("Success", f"Audio saved to:\n{filename}")
             self.status_var.set("Ready")
         except Exception as e:
@@ -454,7 +474,7 @@ class VoiceTranslatorGUI:
     
     def _echo_mode_thread(self):
         lang_code = self.languages[self.language_var.get()]
-        slow = self.slow_var.get()
+        speed = resolve_speed(self.slow_var.get())
         
         with sr.Microphone() as source:
             try:
@@ -474,22 +494,15 @@ class VoiceTranslatorGUI:
                 print(f"Translated: {translated_text}")
                 
                 # Now play the translated text in the target language
-                tts = gTTS(text=translated_text, lang=lang_code, slow=slow)
+                audio = synthesize_speech(translated_text, lang_code)
                 temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+                temp_file.write(audio)
                 temp_file.close()
                 
-                tts.save(temp_file.name)
-                
-                # Play audio using pygame
-                pygame.mixer.music.load(temp_file.name)
-                pygame.mixer.music.play()
-                
-                # Wait for playback to finish
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(10)
+                # Play audio using pygame (slow speed is stretched locally)
+                play_audio_file(temp_file.name, speed)
                 
                 # Clean up
-                pygame.mixer.music.unload()
                 os.unlink(temp_file.name)
                 self.status_var.set("Echo mode complete!")
                 
@@ -511,6 +524,7 @@ class VoiceTranslatorGUI:
     
     def on_closing(self):
         """Handle window close event"""
+        self.memory.print_stats()
         try:
             pygame.mixer.quit()
         except:
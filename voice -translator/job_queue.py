@@ -0,0 +1,262 @@
+"""
+Durable job queue for translate/recognize/synthesize workers
+File: job_queue.py
+
+Jobs are delivered at least once: a leased job becomes visible again if
+its worker does not acknowledge it before the visibility timeout expires.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+import config
+
+Job = namedtuple('Job', ['id', 'kind', 'payload', 'data', 'attempts', 'lease_id'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    data BLOB,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_id TEXT,
+    worker TEXT,
+    visible_at REAL NOT NULL,
+    result TEXT,
+    output BLOB,
+    error TEXT,
+    collected INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, visible_at);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+CREATE INDEX IF NOT EXISTS jobs_collect ON jobs (collected, status);
+"""
+
+
+class JobQueue:
+    """Interface every queue broker implements"""
+
+    def enqueue(self, kind, payload, data=None):
+        """Add a job and return its id"""
+        raise NotImplementedError
+
+    def lease(self, worker, visibility_timeout=None):
+        """Take the next visible job for worker, or return None"""
+        raise NotImplementedError
+
+    def ack(self, job, result, output=None):
+        """Store a job's result; returns False if the lease was lost"""
+        raise NotImplementedError
+
+    def fail(self, job, error, retry=True):
+        """Record a failed attempt; the job is retried until max attempts unless retry is False"""
+        raise NotImplementedError
+
+    def get(self, job_id):
+        """Return a job's status, result and output as a dict, or None"""
+        raise NotImplementedError
+
+    def collect(self, limit=100):
+        """Return finished jobs not collected before and mark them collected"""
+        raise NotImplementedError
+
+    def purge(self, retention=None):
+        """Delete collected jobs finished more than retention seconds ago; returns the count"""
+        raise NotImplementedError
+
+    def metrics(self, window=None):
+        """Return queue depth and throughput statistics"""
+        raise NotImplementedError
+
+    def wait(self, job_id, timeout=None, poll_interval=None):
+        """Block until a job is done or failed and return it (None on timeout)"""
+        poll_interval = poll_interval or config.QUEUE_POLL_INTERVAL
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in ('done', 'failed'):
+                return job
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue stored in a local SQLite database file"""
+
+    def __init__(self, path, max_attempts=None, retry_delay=None):
+        self.path = path
+        self.max_attempts = max_attempts or config.QUEUE_MAX_ATTEMPTS
+        self.retry_delay = config.QUEUE_RETRY_DELAY if retry_delay is None else retry_delay
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        """Return this thread's connection; sqlite3 connections are not shared"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, kind, payload, data=None):
+        now = time.time()
+        cursor = self._connection().execute(
+            "INSERT INTO jobs (kind, payload, data, visible_at, created_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload, ensure_ascii=False), data, now, now),
+        )
+        return cursor.lastrowid
+
+    def lease(self, worker, visibility_timeout=None):
+        visibility_timeout = visibility_timeout or config.QUEUE_VISIBILITY_TIMEOUT
+        conn = self._connection()
+        while True:
+            now = time.time()
+            # BEGIN IMMEDIATE takes the write lock so two workers can't lease the same job
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, kind, payload, data, attempts FROM jobs "
+                    "WHERE status IN ('queued', 'leased') AND visible_at <= ? "
+                    "ORDER BY visible_at, id LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                if row['attempts'] >= self.max_attempts:
+                    # Lease expired on the last allowed attempt
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', lease_id = NULL, finished_at = ?, "
+                        "error = COALESCE(error, 'visibility timeout expired') WHERE id = ?",
+                        (now, row['id']),
+                    )
+                    conn.execute("COMMIT")
+                    continue
+
+                lease_id = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE jobs SET status = 'leased', lease_id = ?, worker = ?, "
+                    "attempts = attempts + 1, visible_at = ?, started_at = ? WHERE id = ?",
+                    (lease_id, worker, now + visibility_timeout, now, row['id']),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            return Job(row['id'], row['kind'], json.loads(row['payload']), row['data'],
+                       row['attempts'] + 1, lease_id)
+
+    def ack(self, job, result, output=None):
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = 'done', result = ?, output = ?, error = NULL, "
+            "lease_id = NULL, finished_at = ? WHERE id = ? AND lease_id = ?",
+            (json.dumps(result, ensure_ascii=False), output, time.time(), job.id, job.lease_id),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job, error, retry=True):
+        now = time.time()
+        if not retry or job.attempts >= self.max_attempts:
+            sql = ("UPDATE jobs SET status = 'failed', error = ?, lease_id = NULL, finished_at = ? "
+                   "WHERE id = ? AND lease_id = ?")
+            params = (error, now, job.id, job.lease_id)
+        else:
+            sql = ("UPDATE jobs SET status = 'queued', error = ?, lease_id = NULL, visible_at = ? "
+                   "WHERE id = ? AND lease_id = ?")
+            params = (error, now + self.retry_delay, job.id, job.lease_id)
+        return self._connection().execute(sql, params).rowcount == 1
+
+    def get(self, job_id):
+        row = self._connection().execute(
+            "SELECT id, kind, status, attempts, worker, result, output, error, "
+            "created_at, started_at, finished_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def collect(self, limit=100):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE collected = 0 AND status IN ('done', 'failed') "
+                "ORDER BY finished_at LIMIT ?",
+                (limit,),
+            ).fetchall()
+            jobs = [self.get(row['id']) for row in rows]
+            conn.executemany("UPDATE jobs SET collected = 1 WHERE id = ?",
+                             [(row['id'],) for row in rows])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return jobs
+
+    def purge(self, retention=None):
+        retention = config.QUEUE_RETENTION if retention is None else retention
+        # Freed pages are reused by later jobs, so the file stops growing
+        cursor = self._connection().execute(
+            "DELETE FROM jobs WHERE collected = 1 AND finished_at <= ?",
+            (time.time() - retention,),
+        )
+        return cursor.rowcount
+
+    def metrics(self, window=None):
+        window = window or config.QUEUE_METRICS_WINDOW
+        conn = self._connection()
+        now = time.time()
+        counts = {status: 0 for status in ('queued', 'leased', 'done', 'failed')}
+        for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row['status']] = row['n']
+        recent = conn.execute(
+            "SELECT COUNT(*) AS n, AVG(finished_at - created_at) AS latency, "
+            "AVG(finished_at - started_at) AS service FROM jobs "
+            "WHERE status = 'done' AND finished_at >= ?",
+            (now - window,),
+        ).fetchone()
+        return {
+            'counts': counts,
+            'window_seconds': window,
+            'throughput_per_second': recent['n'] / window,
+            'avg_latency_ms': (recent['latency'] or 0.0) * 1000,
+            'avg_service_ms': (recent['service'] or 0.0) * 1000,
+        }
+
+
+# Broker implementations by URL scheme. As in SQLAlchemy, sqlite:///jobs.db is
+# relative to the working directory and sqlite:////var/queue.db is absolute.
+BROKERS = {
+    'sqlite': SQLiteJobQueue,
+}
+
+
+def open_queue(url):
+    """Open a queue from a broker URL; a plain path means a SQLite file"""
+    scheme, separator, location = url.partition('://')
+    if not separator:
+        return SQLiteJobQueue(url)
+    if scheme not in BROKERS:
+        raise ValueError(f"Unknown queue broker '{scheme}' (available: {', '.join(BROKERS)})")
+    if scheme == 'sqlite' and location.startswith('/'):
+        # sqlite:/// + path: the third slash separates the (empty) host from the path
+        location = location[1:]
+    return BROKERS[scheme](location)
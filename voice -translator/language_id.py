@@ -0,0 +1,140 @@
+"""
+Local language identification using character n-grams
+File: language_id.py
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+
+import config
+
+# Languages written in their own script are identified by script alone
+SCRIPT_RANGES = [
+    ('ko', [(0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)]),
+    ('ja', [(0x3040, 0x309F), (0x30A0, 0x30FF)]),
+    ('zh', [(0x4E00, 0x9FFF), (0x3400, 0x4DBF)]),
+    ('ar', [(0x0600, 0x06FF), (0x0750, 0x077F)]),
+    ('hi', [(0x0900, 0x097F)]),
+    ('te', [(0x0C00, 0x0C7F)]),
+    ('ru', [(0x0400, 0x04FF)]),
+]
+
+# Precomputed Wikipedia n-gram profiles (see build_language_profiles.py)
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'language_profiles.json')
+
+MAX_NGRAM = 3
+MIN_LETTERS = 4
+
+# Han-only text shorter than this may be Japanese (e.g. place names)
+MIN_HAN_ONLY = 6
+
+
+def _normalize(text):
+    """Lowercase and replace everything that is not a letter with a single space"""
+    text = unicodedata.normalize('NFC', text.lower())
+    return ' ' + re.sub(r"[\W\d_]+", ' ', text).strip() + ' '
+
+
+def _ngrams(text):
+    for n in range(1, MAX_NGRAM + 1):
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if gram != ' ' * n:
+                yield n, gram
+
+
+class LanguageIdentifier:
+    """Character n-gram language identifier for the supported languages"""
+
+    def __init__(self, profile_path=PROFILE_PATH):
+        with open(profile_path, encoding='utf-8') as f:
+            languages = json.load(f)['languages']
+
+        # Log probabilities per n-gram, computed once; unseen n-grams get half a count
+        self.models = {}
+        self.unseen = {}
+        for code, profile in languages.items():
+            totals = profile['n_words']
+            self.models[code] = {gram: math.log(count / totals[len(gram) - 1])
+                                 for gram, count in profile['freq'].items()}
+            self.unseen[code] = [math.log(0.5 / total) for total in totals]
+
+    def _script_language(self, text):
+        """Return (code, confidence) for text in a non-Latin script, or None"""
+        totals = {}
+        latin = 0
+        for char in text:
+            point = ord(char)
+            if char.isascii():
+                latin += char.isalpha()
+                continue
+            for code, ranges in SCRIPT_RANGES:
+                if any(low <= point <= high for low, high in ranges):
+                    totals[code] = totals.get(code, 0) + 1
+                    break
+            else:
+                latin += char.isalpha()
+
+        if not totals:
+            return None
+        # Japanese text mixes kana with Chinese characters
+        if totals.get('ja') and totals.get('zh'):
+            totals['ja'] += totals.pop('zh')
+        code, count = max(totals.items(), key=lambda item: item[1])
+        if count < latin:
+            return None
+        if code == 'zh' and count < MIN_HAN_ONLY:
+            # Short Han-only text is as likely to be Japanese
+            return code, 0.5
+        return code, 1.0
+
+    def detect(self, text):
+        """Return (language_code, confidence) with confidence in 0..1"""
+        if not text or not text.strip():
+            return None, 0.0
+
+        script = self._script_language(text)
+        if script:
+            return script
+
+        normalized = _normalize(text)
+        if len(normalized.replace(' ', '')) < MIN_LETTERS:
+            return None, 0.0
+
+        scores = dict.fromkeys(self.models, 0.0)
+        for n, gram in _ngrams(normalized):
+            for code, model in self.models.items():
+                scores[code] += model.get(gram, self.unseen[code][n - 1])
+
+        # n-grams overlap, so temper the summed log-likelihoods before normalizing
+        best_score = max(scores.values())
+        weights = {code: math.exp((score - best_score) / config.LANGID_TEMPERATURE)
+                   for code, score in scores.items()}
+        best = max(weights, key=weights.get)
+        return best, weights[best] / sum(weights.values())
+
+
+_identifier = None
+_identifier_lock = threading.Lock()
+
+
+def get_identifier():
+    """Return the shared identifier, loading the profiles on first use"""
+    global _identifier
+    if _identifier is None:
+        with _identifier_lock:
+            if _identifier is None:
+                _identifier = LanguageIdentifier()
+    return _identifier
+
+
+def detect_language(text, min_confidence=None):
+    """Detect the language code of text, or None unless confidently identified"""
+    if min_confidence is None:
+        min_confidence = config.LANGID_MIN_CONFIDENCE
+    code, confidence = get_identifier().detect(text)
+    return code if confidence >= min_confidence else None
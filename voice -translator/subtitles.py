@@ -0,0 +1,240 @@
+"""
+Long recording transcription to timestamped subtitles
+File: subtitles.py
+"""
+
+import audioop
+import contextlib
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import speech_recognition as sr
+
+import config
+
+
+def format_timestamp(seconds, subtitle_format='srt'):
+    """Format seconds as an SRT (00:00:00,000) or VTT (00:00:00.000) timestamp"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    separator = '.' if subtitle_format == 'vtt' else ','
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+class SubtitleWriter:
+    """Write numbered subtitle cues to an SRT or VTT file"""
+
+    def __init__(self, path, subtitle_format='srt'):
+        self.path = path
+        self.subtitle_format = subtitle_format
+        self.count = 0
+        self.file = open(path, 'w', encoding='utf-8')
+        if subtitle_format == 'vtt':
+            self.file.write("WEBVTT\n\n")
+
+    def write(self, start, end, text):
+        self.count += 1
+        start_ts = format_timestamp(start, self.subtitle_format)
+        end_ts = format_timestamp(end, self.subtitle_format)
+        self.file.write(f"{self.count}\n{start_ts} --> {end_ts}\n{text}\n\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SubtitleTranscriber:
+    """Split a long recording on silence and transcribe the segments in parallel"""
+
+    def __init__(self, translator_app, workers=None):
+        self.translator_app = translator_app
+        self.recognizer = sr.Recognizer()
+        self.workers = workers or config.SUBTITLE_WORKERS
+
+    def iter_segments(self, source):
+        """Yield (start, end, AudioData) speech segments read frame by frame from disk"""
+        frame_count = max(1, int(source.SAMPLE_RATE * config.SUBTITLE_FRAME_MS / 1000))
+        frame_seconds = frame_count / source.SAMPLE_RATE
+        width = source.SAMPLE_WIDTH
+
+        def energy(frame):
+            # 8-bit samples are unsigned (as AudioData assumes); center them before measuring
+            if width == 1:
+                frame = audioop.bias(frame, 1, -128)
+            return audioop.rms(frame, width)
+
+        # Measure ambient noise on the first frames, then replay them
+        calibration = []
+        while len(calibration) * frame_seconds < config.SUBTITLE_CALIBRATION:
+            frame = source.stream.read(frame_count)
+            if not frame:
+                break
+            calibration.append(frame)
+        if not calibration:
+            return
+        levels = sorted(energy(frame) for frame in calibration)
+        ambient = levels[len(levels) // 5]
+        # SUBTITLE_MIN_ENERGY is in 16-bit units; scale it to this file's sample width
+        min_energy = config.SUBTITLE_MIN_ENERGY * 256 ** (width - 2)
+        threshold = max(min_energy, ambient * config.SUBTITLE_SILENCE_RATIO)
+
+        def frames():
+            yield from calibration
+            calibration.clear()
+            while True:
+                frame = source.stream.read(frame_count)
+                if not frame:
+                    return
+                yield frame
+
+        preroll = deque(maxlen=max(1, int(0.3 / frame_seconds)))
+        segment = []
+        segment_start = 0
+        silence_run = 0
+
+        for index, frame in enumerate(frames()):
+            loud = energy(frame) >= threshold
+
+            if not segment:
+                if loud:
+                    segment = list(preroll)
+                    segment_start = index - len(preroll)
+                    segment.append(frame)
+                    silence_run = 0
+                    preroll.clear()
+                else:
+                    preroll.append(frame)
+                continue
+
+            segment.append(frame)
+            silence_run = 0 if loud else silence_run + 1
+            duration = len(segment) * frame_seconds
+            if ((silence_run * frame_seconds >= config.SUBTITLE_MIN_SILENCE
+                    and duration >= config.SUBTITLE_MIN_SEGMENT)
+                    or duration >= config.SUBTITLE_MAX_SEGMENT):
+                start = segment_start * frame_seconds
+                end = start + (len(segment) - silence_run) * frame_seconds
+                yield start, end, sr.AudioData(b''.join(segment), source.SAMPLE_RATE, width)
+                segment = []
+
+        if segment:
+            start = segment_start * frame_seconds
+            end = start + (len(segment) - silence_run) * frame_seconds
+            yield start, end, sr.AudioData(b''.join(segment), source.SAMPLE_RATE, width)
+
+    def _process_segment(self, audio, source_language, target_language):
+        """Recognize one segment and translate it; returns (text, translated) or None.
+
+        translated is None if the translation failed.
+        """
+        try:
+            text = self.recognizer.recognize_google(audio, language=source_language)
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            print(f"❌ API error: {e}")
+            return None
+
+        if not text:
+            return None
+        if target_language == source_language:
+            return text, text
+        try:
+            translated = self.translator_app.translate_text(
+                text, source_language=source_language, target_language=target_language,
+                raise_errors=True
+            )
+        except Exception:
+            return text, None
+        return text, translated
+
+    def _open_audio(self, audio_path):
+        """Open a WAV or AIFF recording for streaming reads"""
+        with open(audio_path, 'rb') as f:
+            if f.read(4) == b'fLaC':
+                # speech_recognition decodes FLAC entirely into memory
+                raise ValueError("FLAC recordings are not streamed; convert to WAV first")
+        return sr.AudioFile(audio_path)
+
+    def transcribe(self, audio_path, source_language='en', target_language='en',
+                   output_base=None, subtitle_format='srt'):
+        """Transcribe a WAV/AIFF recording into source and translated subtitle files"""
+        subtitle_format = subtitle_format.lower()
+        if subtitle_format not in ('srt', 'vtt'):
+            print(f"❌ Subtitle format '{subtitle_format}' not supported (use srt or vtt)")
+            return None
+
+        output_base = output_base or os.path.splitext(audio_path)[0]
+        source_path = f"{output_base}.{source_language}.{subtitle_format}"
+        target_path = f"{output_base}.{target_language}.{subtitle_format}"
+
+        print(f"\n🎞️  Transcribing {audio_path} with {self.workers} workers...")
+        started = time.perf_counter()
+        stats = {'segments': 0, 'recognized': 0, 'untranslated': 0, 'audio_seconds': 0.0}
+
+        with contextlib.ExitStack() as stack:
+            # Validate the recording before any subtitle file is created
+            try:
+                source = stack.enter_context(self._open_audio(audio_path))
+            except (ValueError, FileNotFoundError) as e:
+                print(f"❌ Could not read audio file: {e}")
+                print("💡 Supported formats are WAV (PCM) and AIFF.")
+                return None
+
+            source_writer = SubtitleWriter(source_path, subtitle_format)
+            stack.callback(source_writer.close)
+            target_writer = None
+            if target_language != source_language:
+                target_writer = SubtitleWriter(target_path, subtitle_format)
+                stack.callback(target_writer.close)
+
+            # Segments are written in order; at most this many are held in memory
+            max_pending = self.workers * 2
+            pending = deque()
+
+            def write_next():
+                start, end, future = pending.popleft()
+                result = future.result()
+                if result is None:
+                    return
+                text, translated = result
+                stats['recognized'] += 1
+                source_writer.write(start, end, text)
+                if not target_writer:
+                    return
+                if translated is None:
+                    # Leave the cue out rather than put source text in the translated track
+                    stats['untranslated'] += 1
+                    print(f"⚠️  Segment at {format_timestamp(start, subtitle_format)} could not be translated")
+                    return
+                target_writer.write(start, end, translated)
+
+            with ThreadPoolExecutor(self.workers) as pool:
+                for start, end, audio in self.iter_segments(source):
+                    while len(pending) >= max_pending or (pending and pending[0][2].done()):
+                        write_next()
+                    future = pool.submit(self._process_segment, audio, source_language, target_language)
+                    pending.append((start, end, future))
+                    stats['segments'] += 1
+
+                while pending:
+                    write_next()
+
+            # Frames actually read, including trailing silence
+            stats['audio_seconds'] = source.audio_reader.tell() / source.SAMPLE_RATE
+
+        elapsed = time.perf_counter() - started
+        stats['elapsed'] = elapsed
+        stats['files'] = [source_path] + ([target_path] if target_writer else [])
+        speed = stats['audio_seconds'] / elapsed if elapsed else 0.0
+        print(f"✓ {stats['recognized']}/{stats['segments']} segments transcribed "
+              f"in {elapsed:.1f}s ({speed:.1f}x real time)")
+        if stats['untranslated']:
+            print(f"⚠️  {stats['untranslated']} segments could not be translated and are missing from {target_path}")
+        for path in stats['files']:
+            print(f"✓ Subtitles saved to: {path}")
+        return stats
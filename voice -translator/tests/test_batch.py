@@ -0,0 +1,60 @@
+"""
+Tests for the JSON-lines batch mode
+File: tests/test_batch.py
+"""
+
+import io
+import json
+
+import pytest
+
+from batch import run_batch, run_job
+
+
+class FakeTranslatorApp:
+    """Stands in for VoiceTranslator; translation fails for text containing 'fail'"""
+
+    def translate_text(self, text, source_language='auto', target_language='en', raise_errors=False):
+        if 'fail' in text:
+            if raise_errors:
+                raise ConnectionError("translation service unavailable")
+            return text
+        return f"{text} [{target_language}]"
+
+
+def test_translate_job():
+    result = run_job(FakeTranslatorApp(), '{"id": 7, "text": "Hello", "target": "es"}', 1, 'audio')
+    assert result['ok'] is True
+    assert result['id'] == 7
+    assert result['translated'] == "Hello [es]"
+
+
+def test_translation_failure_is_reported():
+    result = run_job(FakeTranslatorApp(), '{"text": "please fail", "target": "es"}', 1, 'audio')
+    assert result['ok'] is False
+    assert result['error'] == "translation service unavailable"
+    assert 'translated' not in result
+
+
+def test_invalid_jobs_are_reported():
+    assert run_job(FakeTranslatorApp(), 'not json', 1, 'audio')['ok'] is False
+    assert run_job(FakeTranslatorApp(), '{"action": "dance", "text": "Hi"}', 2, 'audio')['ok'] is False
+    assert run_job(FakeTranslatorApp(), '{"target": "es"}', 3, 'audio')['error'] == "missing 'text'"
+
+
+def test_ordered_batch(tmp_path):
+    lines = [json.dumps({'id': i, 'text': 'fail' if i == 3 else f"line {i}"}) for i in range(20)]
+    out = io.StringIO()
+    stats = run_batch(lines, out, FakeTranslatorApp(), workers=3, ordered=True, audio_dir=str(tmp_path))
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r['id'] for r in results] == list(range(20))
+    assert stats == {'jobs': 20, 'failed': 1, 'elapsed': stats['elapsed']}
+    assert not results[3]['ok']
+
+
+@pytest.mark.parametrize('speed', [0, -1, "0.8", float('nan'), True])
+def test_invalid_speed_is_reported(speed):
+    line = json.dumps({'action': 'tts', 'text': "Hola", 'target': 'es', 'speed': speed})
+    result = run_job(FakeTranslatorApp(), line, 1, 'audio')
+    assert result['ok'] is False
+    assert result['error'] == f"'speed' must be a positive number, got {speed!r}"
@@ -0,0 +1,137 @@
+"""
+Tests for the durable SQLite job queue
+File: tests/test_job_queue.py
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from job_queue import SQLiteJobQueue, open_queue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteJobQueue(str(tmp_path / 'jobs.db'), max_attempts=3, retry_delay=0)
+
+
+def test_lease_is_exclusive(queue):
+    job_ids = {queue.enqueue('translate', {'text': f"job {i}"}) for i in range(50)}
+    leased = []
+
+    def work(name):
+        # Each thread has its own connection, like separate worker processes
+        while True:
+            job = queue.lease(name, visibility_timeout=60)
+            if job is None:
+                return
+            leased.append(job.id)
+
+    threads = [threading.Thread(target=work, args=(f"worker-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(leased) == sorted(job_ids)
+
+
+def test_job_is_redelivered_after_visibility_timeout(queue):
+    job_id = queue.enqueue('translate', {'text': "Hello"})
+    first = queue.lease('a', visibility_timeout=0.2)
+    assert first.id == job_id
+    assert queue.lease('b', visibility_timeout=0.2) is None
+
+    time.sleep(0.3)
+    second = queue.lease('b', visibility_timeout=60)
+    assert second.id == job_id
+    assert second.attempts == 2
+    assert second.lease_id != first.lease_id
+
+
+def test_stale_ack_is_rejected(queue):
+    queue.enqueue('translate', {'text': "Hello"})
+    stale = queue.lease('a', visibility_timeout=0.1)
+    time.sleep(0.2)
+    current = queue.lease('b', visibility_timeout=60)
+
+    assert queue.ack(stale, {'translated': "stale"}) is False
+    assert queue.fail(stale, "too late") is False
+    assert queue.ack(current, {'translated': "Hola"}) is True
+    assert queue.get(current.id)['result'] == {'translated': "Hola"}
+
+
+def test_failed_job_is_retried_up_to_max_attempts(queue):
+    job_id = queue.enqueue('translate', {'text': "Hello"})
+    for attempt in range(1, 4):
+        job = queue.lease('a')
+        assert job.attempts == attempt
+        assert queue.fail(job, f"error {attempt}")
+
+    assert queue.lease('a') is None
+    job = queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 3
+    assert job['error'] == "error 3"
+
+
+def test_expired_last_attempt_is_marked_failed(queue):
+    job_id = queue.enqueue('translate', {'text': "Hello"})
+    for _ in range(3):
+        assert queue.lease('a', visibility_timeout=0.05).id == job_id
+        time.sleep(0.1)
+
+    assert queue.lease('a') is None
+    assert queue.get(job_id)['status'] == 'failed'
+
+
+def test_collect_hands_out_each_job_once(queue):
+    for i in range(5):
+        queue.enqueue('synthesize', {'text': f"job {i}"})
+    while True:
+        job = queue.lease('a')
+        if job is None:
+            break
+        queue.ack(job, {'format': 'mp3'}, b'audio')
+
+    first = queue.collect(limit=3)
+    second = queue.collect()
+    assert len(first) == 3
+    assert len(second) == 2
+    assert {job['id'] for job in first}.isdisjoint(job['id'] for job in second)
+    assert second[0]['output'] == b'audio'
+    assert queue.collect() == []
+
+
+def test_purge_deletes_only_collected_jobs(queue):
+    for text in ("one", "two"):
+        queue.enqueue('translate', {'text': text})
+        queue.ack(queue.lease('a'), {'translated': text})
+    collected = queue.collect(limit=1)[0]
+    queue.enqueue('translate', {'text': "three"})
+
+    assert queue.purge(retention=3600) == 0
+    assert queue.purge(retention=0) == 1
+    assert queue.get(collected['id']) is None
+    assert queue.metrics()['counts'] == {'queued': 1, 'leased': 0, 'done': 1, 'failed': 0}
+
+
+def test_open_queue_paths(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert open_queue('jobs.db').path == 'jobs.db'
+    assert open_queue('sqlite:///relative.db').path == 'relative.db'
+    absolute = str(tmp_path / 'absolute.db')
+    assert open_queue('sqlite:///' + absolute).path == absolute
+    assert os.path.exists(absolute)
+    with pytest.raises(ValueError):
+        open_queue('redis://localhost/0')
+
+
+def test_fail_without_retry(queue):
+    job_id = queue.enqueue('translate', {})
+    assert queue.fail(queue.lease('a'), "job has no text", retry=False)
+    assert queue.lease('a') is None
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts'], job['error']) == ('failed', 1, "job has no text")
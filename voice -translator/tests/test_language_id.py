@@ -0,0 +1,82 @@
+"""
+Tests for local language identification
+File: tests/test_language_id.py
+"""
+
+import pytest
+
+from language_id import detect_language, get_identifier
+
+# Short everyday phrases, the kind the translator is typically given
+PHRASES = {
+    'en': ["I need a doctor", "Call me later", "Where is the train station?", "How much does this cost?",
+           "I am very tired today", "Thank you for your help", "Can you help me please?", "What time is it?",
+           "I don't understand", "See you tomorrow", "The food was delicious", "My phone is not working",
+           "Please speak more slowly", "I lost my wallet", "Good morning everyone"],
+    'es': ["Necesito un médico", "Llámame más tarde", "¿Dónde está la estación de tren?", "¿Cuánto cuesta esto?",
+           "Estoy muy cansado hoy", "Gracias por tu ayuda", "¿Puedes ayudarme por favor?", "¿Qué hora es?",
+           "No entiendo", "Hasta mañana", "La comida estaba deliciosa", "Mi teléfono no funciona",
+           "Por favor habla más despacio", "Perdí mi cartera", "Buenos días a todos"],
+    'fr': ["J'ai besoin d'un médecin", "Appelle-moi plus tard", "Où est la gare?", "Combien ça coûte?",
+           "Je suis fatigué", "Merci pour votre aide", "Pouvez-vous m'aider s'il vous plaît?", "Quelle heure est-il?",
+           "Je ne comprends pas", "À demain", "Le repas était délicieux", "Mon téléphone ne marche pas",
+           "Parlez plus lentement s'il vous plaît", "J'ai perdu mon portefeuille", "Bonjour à tous"],
+    'de': ["Ich brauche einen Arzt", "Ruf mich später an", "Wo ist der Bahnhof?", "Wie viel kostet das?",
+           "Ich bin heute sehr müde", "Danke für deine Hilfe", "Kannst du mir bitte helfen?", "Wie spät ist es?",
+           "Ich verstehe das nicht", "Bis morgen", "Das Essen war lecker", "Mein Handy funktioniert nicht",
+           "Bitte sprich langsamer", "Ich habe meine Geldbörse verloren", "Guten Morgen zusammen"],
+    'pt': ["Preciso de um médico", "Me liga mais tarde", "Onde fica a estação de trem?", "Quanto custa isso?",
+           "Estou cansado", "Obrigado pela sua ajuda", "Você pode me ajudar por favor?", "Que horas são?",
+           "Eu não entendo", "Até amanhã", "A comida estava deliciosa", "Meu telefone não está funcionando",
+           "Por favor fale mais devagar", "Perdi minha carteira", "Bom dia a todos"],
+    'it': ["Ho bisogno di un medico", "Chiamami più tardi", "Dov'è la stazione?", "Quanto costa questo?",
+           "Sono molto stanco oggi", "Grazie per il tuo aiuto", "Puoi aiutarmi per favore?", "Che ore sono?",
+           "Non capisco", "A domani", "Il cibo era delizioso", "Il mio telefono non funziona",
+           "Per favore parla più lentamente", "Ho perso il portafoglio", "Buongiorno a tutti"],
+}
+
+CASES = [(code, phrase) for code, phrases in PHRASES.items() for phrase in phrases]
+
+
+@pytest.mark.parametrize('expected,phrase', CASES)
+def test_short_phrases_are_never_confidently_wrong(expected, phrase):
+    assert detect_language(phrase) in (expected, None)
+
+
+def test_short_phrase_accuracy():
+    identifier = get_identifier()
+    best_guesses = sum(identifier.detect(phrase)[0] == expected for expected, phrase in CASES)
+    confident = sum(detect_language(phrase) == expected for expected, phrase in CASES)
+    assert best_guesses >= 0.85 * len(CASES)
+    assert confident >= 0.5 * len(CASES)
+
+
+def test_longer_sentences_are_identified():
+    assert detect_language("The meeting has been moved to Thursday afternoon because of the holiday") == 'en'
+    assert detect_language("La reunión se ha trasladado al jueves por la tarde por el día festivo") == 'es'
+    assert detect_language("Die Besprechung wurde wegen des Feiertags auf Donnerstag verschoben") == 'de'
+
+
+@pytest.mark.parametrize('text', ["I need a doctor", "Estou cansado", "Call me later", "Je suis fatigué"])
+def test_ambiguous_short_phrases_are_left_undecided(text):
+    assert detect_language(text) is None
+
+
+@pytest.mark.parametrize('text,expected', [
+    ("こんにちは", 'ja'), ("東京駅はどこですか", 'ja'), ("我需要一个医生,请帮帮我", 'zh'),
+    ("Привет, как дела?", 'ru'), ("नमस्ते", 'hi'), ("안녕하세요", 'ko'), ("مرحبا", 'ar'), ("నమస్కారం", 'te'),
+])
+def test_script_languages(text, expected):
+    assert detect_language(text) == expected
+
+
+def test_short_han_only_text_is_undecided():
+    # Could be Chinese or Japanese
+    assert detect_language("東京") is None
+
+
+def test_empty_and_too_short_text():
+    assert detect_language("") is None
+    assert detect_language("  ") is None
+    assert detect_language("ok") is None
+    assert detect_language("123 456") is None
@@ -0,0 +1,128 @@
+"""
+Tests for long recording transcription
+File: tests/test_subtitles.py
+"""
+
+import math
+import struct
+import wave
+
+import pytest
+import speech_recognition as sr
+
+from subtitles import SubtitleTranscriber, format_timestamp
+
+RATE = 16000
+
+
+def write_wav(path, parts, sample_width=2):
+    """Write a mono WAV from (seconds, amplitude) parts of silence or a 440 Hz tone.
+
+    Amplitudes are in 16-bit units; 8-bit files are scaled down and unsigned.
+    """
+    samples = []
+    for seconds, amplitude in parts:
+        samples += [int(amplitude * math.sin(2 * math.pi * 440 * i / RATE)) for i in range(int(seconds * RATE))]
+    if sample_width == 1:
+        frames = bytes(128 + sample // 256 for sample in samples)
+    else:
+        frames = struct.pack(f"<{len(samples)}h", *samples)
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(RATE)
+        wav_file.writeframes(frames)
+
+
+@pytest.mark.parametrize('seconds,subtitle_format,expected', [
+    (0, 'srt', "00:00:00,000"),
+    (1.5, 'srt', "00:00:01,500"),
+    (61.0004, 'vtt', "00:01:01.000"),
+    (3723.9996, 'srt', "01:02:04,000"),
+])
+def test_format_timestamp(seconds, subtitle_format, expected):
+    assert format_timestamp(seconds, subtitle_format) == expected
+
+
+def test_iter_segments_splits_on_silence(tmp_path):
+    path = tmp_path / 'speech.wav'
+    write_wav(path, [(1.5, 0), (2.0, 8000), (1.0, 0), (1.5, 8000), (1.0, 0)])
+
+    with sr.AudioFile(str(path)) as source:
+        segments = list(SubtitleTranscriber(None).iter_segments(source))
+
+    assert len(segments) == 2
+    (start1, end1, audio1), (start2, end2, _) = segments
+    # Segments start with a short pre-roll and end where the speech stops
+    assert 1.1 <= start1 <= 1.5 and end1 == pytest.approx(3.5, abs=0.05)
+    assert 4.1 <= start2 <= 4.5 and end2 == pytest.approx(6.0, abs=0.05)
+    assert audio1.sample_rate == RATE
+    assert len(audio1.frame_data) >= (end1 - start1) * RATE * 2
+
+
+def test_iter_segments_8_bit(tmp_path):
+    path = tmp_path / 'speech.wav'
+    write_wav(path, [(1.5, 0), (2.0, 8000), (1.0, 0)], sample_width=1)
+
+    with sr.AudioFile(str(path)) as source:
+        segments = list(SubtitleTranscriber(None).iter_segments(source))
+
+    assert len(segments) == 1
+    assert segments[0][1] == pytest.approx(3.5, abs=0.05)
+
+
+def test_iter_segments_splits_long_speech(tmp_path, monkeypatch):
+    monkeypatch.setattr('config.SUBTITLE_MAX_SEGMENT', 2.0)
+    path = tmp_path / 'speech.wav'
+    write_wav(path, [(1.0, 0), (5.0, 8000)])
+
+    with sr.AudioFile(str(path)) as source:
+        segments = list(SubtitleTranscriber(None).iter_segments(source))
+
+    assert len(segments) == 3
+    # Splits happen on frame boundaries (30 ms)
+    assert all(end - start <= 2.03 for start, end, _ in segments)
+
+
+def test_transcribe_reports_audio_read(tmp_path, monkeypatch):
+    path = tmp_path / 'speech.wav'
+    write_wav(path, [(1.0, 0), (1.5, 8000), (2.0, 0)])
+    transcriber = SubtitleTranscriber(None, workers=2)
+    monkeypatch.setattr(transcriber, '_process_segment', lambda audio, src, tgt: ("hello", "hola"))
+
+    stats = transcriber.transcribe(str(path), 'en', 'es')
+
+    assert stats['audio_seconds'] == pytest.approx(4.5)
+    assert stats['recognized'] == 1
+    assert (tmp_path / 'speech.es.srt').read_text(encoding='utf-8').endswith("hola\n\n")
+
+
+@pytest.mark.parametrize('content', [b'fLaC\x00\x00\x00\x22', b'not audio at all'])
+def test_unreadable_audio_creates_no_subtitle_files(tmp_path, content):
+    path = tmp_path / 'speech.flac'
+    path.write_bytes(content)
+
+    assert SubtitleTranscriber(None).transcribe(str(path), 'en', 'es') is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['speech.flac']
+
+
+class FailingTranslatorApp:
+    def translate_text(self, text, source_language='auto', target_language='en', raise_errors=False):
+        if raise_errors:
+            raise ConnectionError("translation service unavailable")
+        return text
+
+
+def test_failed_translations_are_counted_not_written(tmp_path, monkeypatch, capsys):
+    path = tmp_path / 'speech.wav'
+    write_wav(path, [(1.0, 0), (1.5, 8000), (1.0, 0), (1.5, 8000), (1.0, 0)])
+    transcriber = SubtitleTranscriber(FailingTranslatorApp(), workers=2)
+    monkeypatch.setattr(transcriber.recognizer, 'recognize_google', lambda audio, language='en': "hello")
+
+    stats = transcriber.transcribe(str(path), 'en', 'es')
+
+    assert stats['recognized'] == 2
+    assert stats['untranslated'] == 2
+    assert (tmp_path / 'speech.en.srt').read_text(encoding='utf-8').count("hello") == 2
+    assert (tmp_path / 'speech.es.srt').read_text(encoding='utf-8') == ""
+    assert "2 segments could not be translated" in capsys.readouterr().out
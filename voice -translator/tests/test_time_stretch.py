@@ -0,0 +1,70 @@
+"""
+Tests for pitch-preserving playback speed
+File: tests/test_time_stretch.py
+"""
+
+import numpy as np
+import pytest
+
+import config
+from time_stretch import time_stretch
+from utils import parse_speed, resolve_speed
+
+RATE = 22050
+
+
+def tone(seconds, frequency=440, channels=None, dtype=np.int16):
+    t = np.arange(int(seconds * RATE)) / RATE
+    samples = (0.5 * np.iinfo(np.int16).max * np.sin(2 * np.pi * frequency * t)).astype(dtype)
+    return samples if channels is None else np.repeat(samples[:, None], channels, axis=1)
+
+
+def dominant_frequency(samples):
+    spectrum = np.abs(np.fft.rfft(samples.astype(np.float64) * np.hanning(len(samples))))
+    return np.fft.rfftfreq(len(samples), 1 / RATE)[np.argmax(spectrum)]
+
+
+@pytest.mark.parametrize('speed', [0.5, 0.75, 1.5, 2.0])
+def test_length_follows_speed(speed):
+    stretched = time_stretch(tone(2.0), speed, RATE)
+    assert len(stretched) == pytest.approx(2.0 * RATE / speed, rel=0.02)
+
+
+@pytest.mark.parametrize('speed', [0.5, 0.75, 1.5])
+def test_pitch_is_preserved(speed):
+    stretched = time_stretch(tone(2.0, frequency=440), speed, RATE)
+    middle = stretched[len(stretched) // 4: 3 * len(stretched) // 4]
+    assert dominant_frequency(middle) == pytest.approx(440, abs=5)
+
+
+def test_dtype_and_channels_are_kept():
+    stereo = tone(1.0, channels=2)
+    stretched = time_stretch(stereo, 0.75, RATE)
+    assert stretched.dtype == np.int16
+    assert stretched.ndim == 2 and stretched.shape[1] == 2
+    assert time_stretch(tone(1.0, dtype=np.float32) / 32768, 1.5, RATE).dtype == np.float32
+
+
+def test_normal_speed_and_empty_input_are_copied():
+    samples = tone(0.5)
+    assert np.array_equal(time_stretch(samples, 1.0, RATE), samples)
+    assert len(time_stretch(np.zeros(0, dtype=np.int16), 0.5, RATE)) == 0
+
+
+def test_invalid_speed():
+    with pytest.raises(ValueError):
+        time_stretch(tone(0.5), 0, RATE)
+
+
+def test_resolve_speed():
+    assert resolve_speed() == 1.0
+    assert resolve_speed(slow=True) == config.SLOW_SPEED
+    assert resolve_speed(slow=True, speed=1.5) == 1.5
+
+
+@pytest.mark.parametrize('answer,expected', [
+    ('y', config.SLOW_SPEED), (' Y ', config.SLOW_SPEED), ('n', 1.0), ('', 1.0),
+    ('1.5', 1.5), ('0.6', 0.6), ('0', 1.0), ('-2', 1.0), ('fast', 1.0), ('nan', 1.0), ('inf', 1.0),
+])
+def test_parse_speed(answer, expected):
+    assert parse_speed(answer) == expected
@@ -0,0 +1,109 @@
+"""
+Tests for the fuzzy translation memory
+File: tests/test_translation_memory.py
+"""
+
+from translation_memory import TranslationMemory, extract_placeholders
+
+
+def test_extract_placeholders_numbers_only():
+    template, values = extract_placeholders("Please send 3 A4 boxes to Maria by 5:30.")
+    assert template == "Please send # A4 boxes to Maria by #."
+    assert values == ('3', '5:30')
+
+
+def test_exact_hit():
+    memory = TranslationMemory()
+    memory.add("Hello, how are you?", "Hola, ¿cómo estás?", 'en', 'es')
+    assert memory.lookup("Hello, how are you?", 'en', 'es') == ("Hola, ¿cómo estás?", 'exact')
+
+
+def test_punctuation_and_case_differences_hit():
+    memory = TranslationMemory()
+    memory.add("Hello, how are you?", "Hola, ¿cómo estás?", 'en', 'es')
+    assert memory.lookup("hello how are you", 'en', 'es') == ("Hola, ¿cómo estás?", 'exact')
+
+
+def test_placeholders_are_substituted():
+    memory = TranslationMemory()
+    memory.add("Please send 3 boxes to Maria by 5:30.",
+               "Por favor envía 3 cajas a Maria antes de las 5:30.", 'en', 'es')
+    translation, match_type = memory.lookup("Please send 12 boxes to Maria by 6:45!", 'en', 'es')
+    assert translation == "Por favor envía 12 cajas a Maria antes de las 6:45."
+    assert match_type == 'fuzzy'
+
+
+def test_capitalized_words_are_not_substituted():
+    memory = TranslationMemory()
+    memory.add("I live in France", "J'habite en France", 'en', 'fr')
+    memory.add("Das Auto ist rot", "The car is red", 'de', 'en')
+
+    assert memory.lookup("I live in Japan", 'en', 'fr') is None
+    assert memory.lookup("Das Haus ist rot", 'de', 'en') is None
+    source, translation, _ = memory.suggest("I live in Japan", 'en', 'fr')
+    assert (source, translation) == ("I live in France", "J'habite en France")
+
+
+def test_placeholders_not_found_in_translation_only_match_same_values():
+    memory = TranslationMemory()
+    memory.add("Order 1000 units", "Pedir 1.000 unidades", 'en', 'es')
+    assert memory.lookup("Order 1000 units", 'en', 'es') == ("Pedir 1.000 unidades", 'exact')
+    assert memory.lookup("Order 2000 units", 'en', 'es') is None
+
+
+def test_different_sentences_are_not_served():
+    memory = TranslationMemory()
+    memory.add("Turn on the lights in the living room please",
+               "Enciende las luces de la sala, por favor", 'en', 'es')
+    memory.add("Please do not open the kitchen window today",
+               "Por favor no abras la ventana de la cocina hoy", 'en', 'es')
+    memory.add("The meeting has not been moved to the afternoon",
+               "La reunión no se ha movido a la tarde", 'en', 'es')
+
+    assert memory.lookup("Turn off the lights in the living room please", 'en', 'es') is None
+    assert memory.lookup("Please do open the kitchen window today", 'en', 'es') is None
+    assert memory.lookup("The meeting has been moved to the afternoon", 'en', 'es') is None
+
+
+def test_similar_sentence_is_only_suggested():
+    memory = TranslationMemory()
+    memory.add("Turn on the lights in the living room please",
+               "Enciende las luces de la sala, por favor", 'en', 'es')
+    source, translation, similarity = memory.suggest(
+        "Turn off the lights in the living room please", 'en', 'es')
+    assert source == "Turn on the lights in the living room please"
+    assert translation == "Enciende las luces de la sala, por favor"
+    assert similarity >= memory.threshold
+
+
+def test_language_pairs_are_separate():
+    memory = TranslationMemory()
+    memory.add("Good night", "Buenas noches", 'en', 'es')
+    assert memory.lookup("Good night", 'en', 'fr') is None
+
+
+def test_hit_counters():
+    memory = TranslationMemory()
+    memory.add("Call 5 times", "Llama 5 veces", 'en', 'es')
+    memory.lookup("Call 5 times", 'en', 'es')
+    memory.lookup("Call 7 times", 'en', 'es')
+    memory.lookup("Never call me", 'en', 'es')
+
+    stats = memory.stats()
+    assert stats['lookups'] == 3
+    assert stats['exact_hits'] == 1
+    assert stats['fuzzy_hits'] == 1
+    assert abs(stats['hit_rate'] - 2 / 3) < 1e-9
+    assert stats['avg_lookup_ms'] >= 0
+
+
+def test_suggest_among_many_entries():
+    memory = TranslationMemory()
+    for i in range(500):
+        memory.add(f"Reminder number {i}: water plant {i % 7} in room {i % 13}", f"Recordatorio {i}", 'en', 'es')
+    memory.add("Turn on the lights in the living room please",
+               "Enciende las luces de la sala, por favor", 'en', 'es')
+
+    source, _, _ = memory.suggest("Turn off the lights in the living room please", 'en', 'es')
+    assert source == "Turn on the lights in the living room please"
+    assert memory.suggest("Where can I buy a ticket for the museum", 'en', 'es') is None
@@ -0,0 +1,102 @@
+"""
+Tests for parallel gTTS chunk fetching
+File: tests/test_tts_backend.py
+"""
+
+import base64
+import random
+import threading
+import time
+
+import pytest
+import requests
+from gtts import gTTSError
+
+import tts_backend
+from tts_backend import ParallelTTS
+
+TEXT = " ".join(f"Sentence number {i} is long enough to need a chunk of its own." for i in range(30))
+
+
+class FakeResponse:
+    def __init__(self, audio=b'', status_code=200):
+        self.status_code = status_code
+        self.reason = 'OK' if status_code == 200 else 'Service Unavailable'
+        encoded = base64.b64encode(audio).decode('ascii')
+        self.lines = [b')]}\'', f'[["wrb.fr","jQ1olc","[\\"{encoded}\\"]",null,null,null,"generic"]]'.encode()]
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise requests.exceptions.HTTPError(f"{self.status_code} {self.reason}", response=self)
+
+    def iter_lines(self, chunk_size=1024):
+        return iter(self.lines)
+
+
+class FakeSession:
+    """Answers each chunk request with its index after a random delay"""
+
+    def __init__(self, bodies, fail_index=None, error=None):
+        self.bodies = bodies
+        self.fail_index = fail_index
+        self.error = error
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def send(self, prepared_request, proxies=None, timeout=None):
+        index = self.bodies.index(prepared_request.body)
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(random.uniform(0, 0.05))
+            if index == self.fail_index:
+                if self.error:
+                    raise self.error
+                return FakeResponse(status_code=503)
+            return FakeResponse(f"<chunk {index}>".encode())
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def tts():
+    return ParallelTTS(TEXT, lang='en')
+
+
+def fake_session(monkeypatch, tts, **kwargs):
+    session = FakeSession([request.body for request in tts.tts._prepare_requests()], **kwargs)
+    monkeypatch.setattr(tts_backend, '_session', session)
+    return session
+
+
+def test_chunks_are_reassembled_in_order(monkeypatch, tts):
+    session = fake_session(monkeypatch, tts)
+    assert len(session.bodies) > 10
+
+    chunks = list(tts.stream())
+
+    assert chunks == [f"<chunk {i}>".encode() for i in range(len(session.bodies))]
+    assert session.max_active > 1
+    assert tts_backend.get_session() is session
+
+
+def test_write_to_fp_joins_chunks(monkeypatch, tts, tmp_path):
+    session = fake_session(monkeypatch, tts)
+    path = tmp_path / 'speech.mp3'
+    tts.save(path)
+    assert path.read_bytes() == b''.join(f"<chunk {i}>".encode() for i in range(len(session.bodies)))
+
+
+def test_http_error_becomes_gtts_error(monkeypatch, tts):
+    fake_session(monkeypatch, tts, fail_index=3)
+    with pytest.raises(gTTSError, match="503"):
+        list(tts.stream())
+
+
+def test_connection_error_becomes_gtts_error(monkeypatch, tts):
+    fake_session(monkeypatch, tts, fail_index=0, error=requests.exceptions.ConnectionError("refused"))
+    with pytest.raises(gTTSError, match="Failed to connect"):
+        list(tts.stream())
@@ -0,0 +1,53 @@
+"""
+Tests for speech synthesis helpers
+File: tests/test_utils.py
+"""
+
+import pytest
+
+import utils
+
+
+class FakeTTS:
+    """Stands in for ParallelTTS, yielding one chunk per word"""
+
+    calls = 0
+
+    def __init__(self, text, lang='en', slow=False):
+        self.words = text.split()
+        FakeTTS.calls += 1
+
+    def stream(self):
+        for word in self.words:
+            if word == 'fail':
+                raise ConnectionError("chunk request failed")
+            yield word.encode() + b';'
+
+
+@pytest.fixture(autouse=True)
+def fake_tts(monkeypatch):
+    FakeTTS.calls = 0
+    monkeypatch.setattr(utils, 'ParallelTTS', FakeTTS)
+    monkeypatch.setattr(utils, '_speech_cache', utils.OrderedDict())
+
+
+def test_stream_speech_yields_chunks_then_caches():
+    stream = utils.stream_speech("one two three", 'en')
+    assert next(stream) == b'one;'
+    assert ("one two three", 'en') not in utils._speech_cache
+    assert list(stream) == [b'two;', b'three;']
+
+    assert utils.synthesize_speech("one two three", 'en') == b'one;two;three;'
+    assert FakeTTS.calls == 1
+
+
+def test_failed_synthesis_is_not_cached():
+    with pytest.raises(ConnectionError):
+        utils.synthesize_speech("one fail", 'en')
+    assert utils._speech_cache == {}
+
+
+def test_save_speech_writes_streamed_mp3(tmp_path):
+    path = utils.save_speech("hello world", 'en', str(tmp_path / 'hello.mp3'))
+    with open(path, 'rb') as f:
+        assert f.read() == b'hello;world;'
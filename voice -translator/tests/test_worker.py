@@ -0,0 +1,134 @@
+"""
+Tests for queue-backed job execution
+File: tests/test_worker.py
+"""
+
+import io
+import json
+import math
+import struct
+import wave
+
+import pytest
+
+import utils
+from job_queue import Job, SQLiteJobQueue
+from worker import InvalidJobError, execute_job, submit
+
+RATE = 22050
+
+
+def wav_bytes(seconds=1.0, rate=RATE):
+    samples = [int(8000 * math.sin(2 * math.pi * 440 * i / rate)) for i in range(int(seconds * rate))]
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return buffer.getvalue()
+
+
+class FakeRecognizer:
+    def record(self, source):
+        return source.stream.read(-1)
+
+    def recognize_google(self, audio, language='en'):
+        return "hello world"
+
+
+class FakeTranslatorApp:
+    """Stands in for VoiceTranslator; translation fails for text containing 'fail'"""
+
+    def __init__(self):
+        self.recognizer = FakeRecognizer()
+
+    def translate_text(self, text, source_language='auto', target_language='en', raise_errors=False):
+        if 'fail' in text:
+            if raise_errors:
+                raise ConnectionError("translation service unavailable")
+            return text
+        return f"{text} [{target_language}]"
+
+
+def job(kind, payload, data=None):
+    return Job(1, kind, payload, data, 1, 'lease')
+
+
+def test_translate_job():
+    result, output = execute_job(FakeTranslatorApp(), job('translate', {'text': "Hello", 'target': 'es'}))
+    assert result == {'translated': "Hello [es]"}
+    assert output is None
+
+
+def test_translation_failure_raises():
+    with pytest.raises(ConnectionError):
+        execute_job(FakeTranslatorApp(), job('translate', {'text': "please fail", 'target': 'es'}))
+
+
+def test_recognize_job_translates_text():
+    result, _ = execute_job(FakeTranslatorApp(), job('recognize', {'target': 'fr'}, wav_bytes(0.2)))
+    assert result == {'text': "hello world", 'translated': "hello world [fr]"}
+
+
+@pytest.mark.parametrize('kind,payload,data', [
+    ('recognize', {}, None),
+    ('recognize', {}, b'not audio'),
+    ('translate', {'target': 'es'}, None),
+    ('dance', {'text': "Hello"}, None),
+])
+def test_invalid_jobs(kind, payload, data):
+    with pytest.raises(InvalidJobError):
+        execute_job(FakeTranslatorApp(), job(kind, payload, data))
+
+
+def test_synthesize_normal_speed_returns_mp3(monkeypatch):
+    monkeypatch.setattr(utils, 'synthesize_speech', lambda text, language='en': b'mp3 ' + text.encode())
+    result, output = execute_job(FakeTranslatorApp(), job('synthesize', {'text': "Hola", 'language': 'es'}))
+    assert result == {'format': 'mp3'}
+    assert output == b'mp3 Hola'
+
+
+def test_stretched_speech_round_trips_as_wav(monkeypatch):
+    monkeypatch.setattr(utils, 'synthesize_speech', lambda text, language='en': wav_bytes(1.0))
+    payload = {'text': "Good night", 'target': 'fr', 'speed': 0.5}
+
+    result, output = execute_job(FakeTranslatorApp(), job('translate+synthesize', payload))
+
+    assert result == {'translated': "Good night [fr]", 'format': 'wav'}
+    with wave.open(io.BytesIO(output)) as wav_file:
+        seconds = wav_file.getnframes() / wav_file.getframerate()
+    assert seconds == pytest.approx(2.0, rel=0.05)
+
+
+def test_submit_maps_actions_and_reads_audio(tmp_path, capsys):
+    queue = SQLiteJobQueue(str(tmp_path / 'jobs.db'))
+    audio_path = tmp_path / 'speech.wav'
+    audio_path.write_bytes(wav_bytes(0.1))
+    lines = [
+        json.dumps({'action': 'tts', 'text': "Hola", 'target': 'es'}),
+        json.dumps({'action': 'translate+tts', 'text': "Good night", 'target': 'fr'}),
+        '',
+        json.dumps({'kind': 'recognize', 'audio_path': str(audio_path), 'language': 'en'}),
+        json.dumps({'text': "Hello"}),
+        json.dumps({'kind': 'dance', 'text': "Hello"}),
+        'not json',
+    ]
+
+    submit(queue, lines)
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record['line'] for record in records] == [1, 2, 4, 5, 6, 7]
+    assert "unknown job kind 'dance'" in records[4]['error']
+    assert 'error' in records[5]
+
+    kinds = []
+    while True:
+        leased = queue.lease('test')
+        if leased is None:
+            break
+        kinds.append(leased.kind)
+        if leased.kind == 'recognize':
+            assert leased.data == audio_path.read_bytes()
+            assert 'audio_path' not in leased.payload
+    assert kinds == ['synthesize', 'translate+synthesize', 'recognize', 'translate']
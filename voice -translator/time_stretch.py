@@ -0,0 +1,75 @@
+"""
+Pitch-preserving time-stretch (WSOLA) for playback speed control
+File: time_stretch.py
+"""
+
+import numpy as np
+
+FRAME_MS = 40       # Analysis/synthesis frame length
+TOLERANCE_MS = 10   # How far a frame may shift to stay in phase
+SEARCH_RATE = 11025 # Similarity search runs on audio decimated to about this rate
+
+
+def _hann(length):
+    """Periodic Hann window; overlapping halves sum to exactly one"""
+    return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(length) / length)
+
+
+def time_stretch(samples, speed, sample_rate):
+    """Change the tempo of audio without changing its pitch.
+
+    samples is an array of shape (n,) or (n, channels); speed > 1 plays faster
+    and speed < 1 slower. Returns an array of the same dtype and channel layout.
+    """
+    if speed <= 0:
+        raise ValueError(f"Speed must be positive, got {speed}")
+
+    samples = np.asarray(samples)
+    if speed == 1 or len(samples) == 0:
+        return samples.copy()
+
+    dtype = samples.dtype
+    mono_input = samples.ndim == 1
+    audio = samples.reshape(len(samples), -1).astype(np.float32)
+
+    frame = max(2, int(sample_rate * FRAME_MS / 1000)) // 2 * 2
+    hop = frame // 2
+    tolerance = int(sample_rate * TOLERANCE_MS / 1000)
+    step = max(1, sample_rate // SEARCH_RATE)
+
+    # Pad so every candidate frame and search window stays in bounds
+    padded = np.pad(audio, ((tolerance, frame + 2 * tolerance), (0, 0)))
+    guide = padded.mean(axis=1)[::step]
+    guide_frame = frame // step
+    guide_tolerance = tolerance // step
+
+    frame_count = int(len(audio) / (hop * speed)) + 1
+    positions = np.empty(frame_count, dtype=np.int64)
+    positions[0] = tolerance
+    for k in range(1, frame_count):
+        # Pick the frame near the nominal position that best continues the previous one
+        natural = (positions[k - 1] + hop) // step
+        nominal = int(round(k * hop * speed)) + tolerance
+        start = nominal // step - guide_tolerance
+        template = guide[natural:natural + guide_frame]
+        region = guide[start:start + guide_frame + 2 * guide_tolerance]
+        if len(template) < guide_frame or len(region) < guide_frame + 2 * guide_tolerance:
+            positions[k] = nominal
+            continue
+        scores = np.correlate(region, template, mode='valid')
+        positions[k] = (start + int(np.argmax(scores))) * step
+
+    # Overlap-add: even and odd frames each tile the output back to back
+    frames = padded[positions[:, None] + np.arange(frame)] * _hann(frame)[None, :, None]
+    output = np.zeros(((frame_count + 1) * hop, audio.shape[1]), dtype=np.float32)
+    even = frames[0::2].reshape(-1, audio.shape[1])
+    odd = frames[1::2].reshape(-1, audio.shape[1])
+    output[:len(even)] += even
+    output[hop:hop + len(odd)] += odd
+    output = output[:int(round(len(audio) / speed))]
+
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        output = np.clip(np.round(output), info.min, info.max)
+    output = np.ascontiguousarray(output.astype(dtype))
+    return output[:, 0] if mono_input else output
@@ -0,0 +1,290 @@
+"""
+Fuzzy translation memory with a MinHash/LSH index
+File: translation_memory.py
+"""
+
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+import config
+
+TOKEN_PATTERN = re.compile(r"\d+(?:[.,:]\d+)*|\w+", re.UNICODE)
+SENTENCE_END = re.compile(r"[.!?¿¡]\s*$")
+SIGNATURE_MARGIN = 0.15
+
+
+def extract_placeholders(text):
+    """Replace numbers with '#'; return (template, values).
+
+    Only numbers are safe to copy into a translation unchanged. Capitalized
+    words are not treated as names: nouns are capitalized in German, and
+    names such as countries are often translated.
+    """
+    parts = []
+    values = []
+    position = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        # Digits inside words (e.g. "A4") are part of the word
+        if token[0].isdigit():
+            parts.append(text[position:match.start()])
+            parts.append('#')
+            values.append(token)
+            position = match.end()
+    parts.append(text[position:])
+    return ''.join(parts), tuple(values)
+
+
+def _mask_names(template):
+    """Replace capitalized words that do not start a sentence with '#'.
+
+    Used only to find suggestions for sentences that differ in a name;
+    such translations are never served, since names may need translating.
+    """
+    def replace(match):
+        word = match.group()
+        before = template[:match.start()]
+        if len(word) > 1 and word.istitle() and before.strip() and not SENTENCE_END.search(before):
+            return '#'
+        return word
+    return re.sub(r"\w+", replace, template)
+
+
+def _normalize(template):
+    """Lowercase and drop punctuation so near-identical sentences share shingles"""
+    return ' '.join(re.sub(r"[^\w#]+", ' ', template.lower()).split())
+
+
+def _shingles(normalized):
+    size = config.TM_SHINGLE_SIZE
+    if len(normalized) <= size:
+        return frozenset([normalized])
+    return frozenset(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+
+
+def _similarity(shingles, entry):
+    """Jaccard similarity to a stored entry; its shingles are rebuilt to save memory"""
+    other = _shingles(_normalize(extract_placeholders(entry['source'])[0]))
+    union = len(shingles | other)
+    return len(shingles & other) / union if union else 0.0
+
+
+def _template_translation(translation, values):
+    """Put placeholders into a translation, or None if the values can't be located"""
+    if len(set(values)) != len(values):
+        return None
+    template = translation
+    for index, value in enumerate(values):
+        pattern = r"(?<!\w)" + re.escape(value) + r"(?!\w)"
+        if len(re.findall(pattern, template)) != 1:
+            return None
+        template = re.sub(pattern, f"\x00{index}\x00", template)
+    return template
+
+
+class TranslationMemory:
+    """Remember translated segments and reuse them for near-duplicates.
+
+    A stored translation is only served when the new segment has the same
+    wording, differing at most in numbers, case or punctuation.
+    Other similar segments found through the MinHash index are offered as
+    suggestions, never as the translation.
+    """
+
+    def __init__(self, threshold=None, max_entries=None):
+        self.threshold = config.TM_SIMILARITY_THRESHOLD if threshold is None else threshold
+        self.max_entries = max_entries or config.TM_MAX_ENTRIES
+        self.bands = config.TM_BANDS
+        self.rows = config.TM_NUM_PERM // config.TM_BANDS
+
+        # Fixed permutation coefficients so signatures are stable across runs
+        # Multiply-shift hashing: the top 32 bits of (a * h + b) mod 2**64,
+        # with 64-bit a and b derived from fixed seeds
+        def seeds(prefix):
+            return np.array([zlib.crc32(f"{prefix}{i}".encode()) << 32 | zlib.crc32(f"{prefix}{i}'".encode())
+                             for i in range(self.bands * self.rows)], dtype=np.uint64)[:, None]
+        self.perm_a = seeds('a') | np.uint64(1)
+        self.perm_b = seeds('b')
+
+        self.entries = []
+        self.exact = {}
+        self.templates = {}
+        self.name_templates = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.lookup_seconds = 0.0
+
+    def _signature(self, shingles):
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        # uint64 arithmetic wraps, which is exactly the mod 2**64 needed here
+        return ((self.perm_a * hashes + self.perm_b) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, pair, signature):
+        """Return the LSH bucket keys of a signature; computed outside the lock.
+
+        Keys are hashed to ints to keep the index small; a collision only
+        adds a candidate that the similarity check then rejects.
+        """
+        rows = self.rows
+        return [hash((pair, band, signature[band * rows:(band + 1) * rows].tobytes()))
+                for band in range(self.bands)]
+
+    def _render(self, entry, values):
+        """Fill the entry's translation with the values of the new segment"""
+        if values == entry['values']:
+            return entry['translation']
+        if entry['template'] is None or len(values) != len(entry['values']):
+            return None
+        translation = entry['template']
+        for index, value in enumerate(values):
+            translation = translation.replace(f"\x00{index}\x00", value)
+        return translation
+
+    def add(self, text, translation, source_language, target_language):
+        """Store a translated segment"""
+        if not text or not translation:
+            return
+        pair = (source_language, target_language)
+        template, values = extract_placeholders(text.strip())
+        normalized = _normalize(template)
+        entry = {
+            'source': text.strip(),
+            'values': values,
+            'translation': translation,
+            'template': _template_translation(translation, values),
+        }
+        name_key = (pair, _normalize(_mask_names(template)))
+        shingles = _shingles(normalized)
+        signature = self._signature(shingles)
+        entry['size'] = len(shingles)
+        entry['signature'] = signature.tobytes()
+        band_keys = self._band_keys(pair, signature)
+
+        with self.lock:
+            key = (pair, normalized, values)
+            if key in self.exact or len(self.entries) >= self.max_entries:
+                return
+            self.exact[key] = entry
+            self.templates.setdefault((pair, normalized), []).append(entry)
+            self.name_templates.setdefault(name_key, []).append(entry)
+            entry_id = len(self.entries)
+            self.entries.append(entry)
+            for band_key in band_keys:
+                # Most buckets hold one entry, stored as a bare id to save memory
+                bucket = self.buckets.get(band_key)
+                if bucket is None:
+                    self.buckets[band_key] = entry_id
+                elif isinstance(bucket, int):
+                    self.buckets[band_key] = [bucket, entry_id]
+                else:
+                    bucket.append(entry_id)
+
+    def lookup(self, text, source_language, target_language):
+        """Return (translation, 'exact' or 'fuzzy') for a reusable match, or None.
+
+        A fuzzy match has the same template as text and differs only in
+        placeholder values or punctuation; its values are substituted.
+        """
+        started = time.perf_counter()
+        pair = (source_language, target_language)
+        template, values = extract_placeholders(text.strip())
+        normalized = _normalize(template)
+
+        with self.lock:
+            self.lookups += 1
+            try:
+                entry = self.exact.get((pair, normalized, values))
+                if entry:
+                    self.exact_hits += 1
+                    return entry['translation'], 'exact'
+
+                for entry in self.templates.get((pair, normalized), ()):
+                    translation = self._render(entry, values)
+                    if translation is not None:
+                        self.fuzzy_hits += 1
+                        return translation, 'fuzzy'
+                return None
+            finally:
+                self.lookup_seconds += time.perf_counter() - started
+
+    def suggest(self, text, source_language, target_language):
+        """Return (source, translation, similarity) of a stored segment that
+        differs only in names, or else the most similar one above the
+        threshold; None if there is none. The translation belongs to a
+        different sentence and must not be used as-is."""
+        if not self.entries:
+            return None
+        pair = (source_language, target_language)
+        template, values = extract_placeholders(text.strip())
+        shingles = _shingles(_normalize(template))
+        name_key = (pair, _normalize(_mask_names(template)))
+        signature = self._signature(shingles)
+        band_keys = self._band_keys(pair, signature)
+
+        with self.lock:
+            same_names = self.name_templates.get(name_key)
+            if same_names:
+                entry = same_names[0]
+            else:
+                entry = None
+                candidate_ids = set()
+                for band_key in band_keys:
+                    bucket = self.buckets.get(band_key)
+                    if isinstance(bucket, int):
+                        candidate_ids.add(bucket)
+                    elif bucket:
+                        candidate_ids.update(bucket)
+                candidates = [self.entries[entry_id] for entry_id in candidate_ids]
+
+        # Entries never change once stored, so similarity is checked without the lock
+        if entry:
+            return entry['source'], entry['translation'], _similarity(shingles, entry)
+
+        best = None
+        best_similarity = self.threshold
+        size = len(shingles)
+        if candidates:
+            # Only rebuild shingles for candidates whose estimated similarity
+            # is within about three standard errors of the threshold
+            stored = np.frombuffer(b''.join(entry['signature'] for entry in candidates), dtype=np.uint32)
+            estimates = (stored.reshape(len(candidates), -1) == signature).mean(axis=1)
+            candidates = [entry for entry, estimate in zip(candidates, estimates)
+                          if estimate >= self.threshold - SIGNATURE_MARGIN]
+        for entry in candidates:
+            # Jaccard similarity can't exceed the ratio of the set sizes
+            if min(size, entry['size']) < best_similarity * max(size, entry['size']):
+                continue
+            similarity = _similarity(shingles, entry)
+            if similarity >= best_similarity:
+                best = (entry['source'], entry['translation'], similarity)
+                best_similarity = similarity
+        return best
+
+    def stats(self):
+        """Return hit rate and average lookup latency"""
+        hits = self.exact_hits + self.fuzzy_hits
+        return {
+            'entries': len(self.entries),
+            'lookups': self.lookups,
+            'exact_hits': self.exact_hits,
+            'fuzzy_hits': self.fuzzy_hits,
+            'hit_rate': hits / self.lookups if self.lookups else 0.0,
+            'avg_lookup_ms': self.lookup_seconds * 1000 / self.lookups if self.lookups else 0.0,
+        }
+
+    def print_stats(self):
+        """Display translation memory statistics"""
+        stats = self.stats()
+        print(f"📚 Translation memory: {stats['entries']} segments, "
+              f"{stats['exact_hits'] + stats['fuzzy_hits']}/{stats['lookups']} hits "
+              f"({stats['hit_rate']:.0%}, {stats['fuzzy_hits']} fuzzy), "
+              f"avg lookup {stats['avg_lookup_ms']:.3f} ms")
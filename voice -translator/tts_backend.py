@@ -0,0 +1,97 @@
+"""
+Parallel gTTS synthesis over a shared keep-alive connection pool
+File: tts_backend.py
+"""
+
+import base64
+import re
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from gtts import gTTS, gTTSError
+
+import config
+
+AUDIO_PATTERN = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+_session = None
+_executor = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared HTTP session, reusing connections across requests"""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=config.TTS_FETCH_WORKERS)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def get_executor():
+    """Return the shared thread pool used to fetch text chunks"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(config.TTS_FETCH_WORKERS, thread_name_prefix='tts-fetch')
+        return _executor
+
+
+class ParallelTTS:
+    """Drop-in for gTTS that fetches all text chunks concurrently"""
+
+    def __init__(self, text, lang='en', slow=False):
+        self.tts = gTTS(text=text, lang=lang, slow=slow)
+
+    def _fetch(self, prepared_request):
+        """Send one chunk request and return its decoded MP3 bytes"""
+        session = get_session()
+        try:
+            response = session.send(
+                prepared_request,
+                proxies=urllib.request.getproxies(),
+                timeout=config.TTS_TIMEOUT,
+            )
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            raise gTTSError(tts=self.tts, response=response)
+        except requests.exceptions.RequestException:
+            raise gTTSError(tts=self.tts)
+
+        parts = []
+        for line in response.iter_lines(chunk_size=1024):
+            decoded_line = line.decode('utf-8')
+            if 'jQ1olc' in decoded_line:
+                audio_search = AUDIO_PATTERN.search(decoded_line)
+                if not audio_search:
+                    raise gTTSError(tts=self.tts, response=response)
+                parts.append(base64.b64decode(audio_search.group(1).encode('ascii')))
+        return b''.join(parts)
+
+    def stream(self):
+        """Yield MP3 bytes chunk by chunk, in order, as soon as each is ready"""
+        executor = get_executor()
+        # _prepare_requests() is private gTTS API; recheck it before changing the gTTS==2.4.0 pin
+        futures = [executor.submit(self._fetch, request) for request in self.tts._prepare_requests()]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def write_to_fp(self, fp):
+        """Write the MP3 audio to a file-like object"""
+        for chunk in self.stream():
+            fp.write(chunk)
+
+    def save(self, savefile):
+        """Save the MP3 audio to a file"""
+        with open(str(savefile), 'wb') as f:
+            self.write_to_fp(f)
@@ -0,0 +1,131 @@
+"""
+Utility functions shared by the CLI and GUI
+File: utils.py
+"""
+
+import io
+import os
+import threading
+import wave
+from collections import OrderedDict
+
+import pygame
+
+import config
+from time_stretch import time_stretch
+from tts_backend import ParallelTTS
+
+# Recently synthesized normal-speed MP3 audio, keyed by (text, language)
+_speech_cache = OrderedDict()
+_speech_cache_lock = threading.Lock()
+
+
+def resolve_speed(slow=False, speed=None):
+    """Return the playback speed factor for the slow flag or an explicit speed"""
+    if speed is not None:
+        return speed
+    return config.SLOW_SPEED if slow else 1.0
+
+
+def parse_speed(answer):
+    """Parse a speed prompt answer: 'y' means slow, a positive number sets the factor"""
+    answer = answer.strip().lower()
+    if answer == 'y':
+        return resolve_speed(slow=True)
+    try:
+        speed = float(answer)
+    except ValueError:
+        return 1.0
+    return speed if 0 < speed < float('inf') else 1.0
+
+
+def stream_speech(text, language='en'):
+    """Yield normal-speed MP3 bytes for text as each chunk arrives, reusing recent audio"""
+    key = (text, language)
+    with _speech_cache_lock:
+        if key in _speech_cache:
+            _speech_cache.move_to_end(key)
+            yield _speech_cache[key]
+            return
+
+    chunks = []
+    for chunk in ParallelTTS(text=text, lang=language).stream():
+        chunks.append(chunk)
+        yield chunk
+
+    # Only cache audio that was synthesized completely
+    with _speech_cache_lock:
+        _speech_cache[key] = b''.join(chunks)
+        while len(_speech_cache) > config.TTS_CACHE_SIZE:
+            _speech_cache.popitem(last=False)
+
+
+def synthesize_speech(text, language='en'):
+    """Return normal-speed MP3 bytes for text, reusing recently synthesized audio"""
+    return b''.join(stream_speech(text, language))
+
+
+def mixer_format():
+    """Return the mixer's (frequency, size, channels), initializing it if needed"""
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            # Headless hosts have no audio device; decoding and stretching still work
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            pygame.mixer.init()
+    return pygame.mixer.get_init()
+
+
+def stretch_sound(sound, speed):
+    """Return a new pygame Sound played at speed without changing pitch"""
+    frequency = mixer_format()[0]
+    samples = pygame.sndarray.array(sound)
+    return pygame.sndarray.make_sound(time_stretch(samples, speed, frequency))
+
+
+def play_audio_file(path, speed=1.0):
+    """Play an audio file with pygame and wait until playback finishes"""
+    if speed == 1:
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play()
+
+        # Wait for playback to finish
+        while pygame.mixer.music.get_busy():
+            pygame.time.Clock().tick(10)
+
+        # Stop playback and unload
+        pygame.mixer.music.stop()
+        pygame.mixer.music.unload()
+        return
+
+    # Other speeds are time-stretched locally from the normal-speed audio
+    sound = stretch_sound(pygame.mixer.Sound(path), speed)
+    channel = sound.play()
+    while channel is not None and channel.get_busy():
+        pygame.time.Clock().tick(10)
+
+
+def save_speech(text, language, filename, speed=1.0):
+    """Save speech to filename and return the path written.
+
+    Normal speed is saved as MP3. Other speeds are stretched locally and,
+    since there is no local MP3 encoder, saved as WAV next to filename.
+    """
+    if speed == 1:
+        # Each chunk is written as soon as it arrives instead of buffering the clip
+        with open(filename, 'wb') as f:
+            for chunk in stream_speech(text, language):
+                f.write(chunk)
+        return filename
+
+    audio = synthesize_speech(text, language)
+    frequency, size, channels = mixer_format()
+    sound = stretch_sound(pygame.mixer.Sound(file=io.BytesIO(audio)), speed)
+    wav_filename = os.path.splitext(filename)[0] + '.wav'
+    with wave.open(wav_filename, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(abs(size) // 8)
+        wav_file.setframerate(frequency)
+        wav_file.writeframes(sound.get_raw())
+    return wav_filename
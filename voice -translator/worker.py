@@ -0,0 +1,268 @@
+"""
+Queue-backed workers for translation, speech recognition and synthesis
+File: worker.py
+
+Usage:
+    python worker.py submit jobs.jsonl --queue jobs.db    # enqueue JSON-lines jobs
+    python worker.py run --queue jobs.db -n 4             # start 4 worker processes
+    python worker.py results --queue jobs.db --follow     # stream results (and audio)
+    python worker.py stats --queue jobs.db                # queue depth and throughput
+
+Each job line has a "kind" (translate, recognize, synthesize or
+translate+synthesize) and the fields it needs, for example:
+    {"kind": "translate", "text": "Hello", "source": "auto", "target": "es"}
+    {"kind": "recognize", "audio_path": "speech.wav", "language": "en", "target": "fr"}
+    {"kind": "synthesize", "text": "Hola", "language": "es", "speed": 0.75}
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+import config
+from job_queue import open_queue
+
+KINDS = ('translate', 'recognize', 'synthesize', 'translate+synthesize')
+
+# Batch-mode action names accepted as job kinds
+ACTION_KINDS = {'tts': 'synthesize', 'translate+tts': 'translate+synthesize'}
+
+
+class InvalidJobError(ValueError):
+    """A job that can never succeed, so it is failed without retrying"""
+
+
+def execute_job(translator_app, job):
+    """Run one job with the VoiceTranslator logic; returns (result, output_bytes)"""
+    import speech_recognition as sr
+    from utils import save_speech, synthesize_speech
+
+    payload = job.payload
+    result = {}
+
+    if job.kind == 'recognize':
+        if not job.data:
+            raise InvalidJobError("recognize job has no audio")
+        language = payload.get('language', 'en')
+        try:
+            with sr.AudioFile(io.BytesIO(job.data)) as source:
+                audio = translator_app.recognizer.record(source)
+        except ValueError as e:
+            raise InvalidJobError(f"unreadable audio: {e}")
+        try:
+            text = translator_app.recognizer.recognize_google(audio, language=language)
+        except sr.UnknownValueError:
+            # Retrying will not help; report it as the job's result
+            return {'text': None, 'error': 'could not understand audio'}, None
+        result['text'] = text
+        if payload.get('target'):
+            result['translated'] = translator_app.translate_text(
+                text, source_language=language, target_language=payload['target'], raise_errors=True)
+        return result, None
+
+    if job.kind not in KINDS:
+        raise InvalidJobError(f"unknown job kind '{job.kind}' (use one of {', '.join(KINDS)})")
+    text = payload.get('text')
+    if not text:
+        raise InvalidJobError(f"{job.kind} job has no text")
+
+    if job.kind in ('translate', 'translate+synthesize'):
+        text = translator_app.translate_text(
+            text, source_language=payload.get('source', 'auto'),
+            target_language=payload.get('target', 'en'), raise_errors=True)
+        result['translated'] = text
+        if job.kind == 'translate':
+            return result, None
+
+    if job.kind in ('synthesize', 'translate+synthesize'):
+        language = payload.get('language') or payload.get('target', 'en')
+        speed = payload.get('speed') or 1.0
+        if speed == 1:
+            result['format'] = 'mp3'
+            return result, synthesize_speech(text, language)
+
+        # Stretched speech is saved as WAV; read it back to return through the queue
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = save_speech(text, language, os.path.join(temp_dir, 'speech.mp3'), speed)
+            with open(path, 'rb') as f:
+                output = f.read()
+            os.unlink(path)
+        finally:
+            os.rmdir(temp_dir)
+        result['format'] = 'wav'
+        return result, output
+
+
+def worker_loop(queue_url, name, visibility_timeout, stop_event, until_empty=False):
+    """Lease, execute and acknowledge jobs until stopped"""
+    # Ctrl-C goes to the whole process group; the parent stops workers between jobs
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Workers never play audio, but decoding speech for speed changes needs a mixer
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from app import VoiceTranslator
+
+    queue = open_queue(queue_url)
+    translator_app = VoiceTranslator()
+    print(f"✓ Worker {name} started")
+
+    while not stop_event.is_set():
+        job = queue.lease(name, visibility_timeout)
+        if job is None:
+            counts = queue.metrics()['counts']
+            if until_empty and counts['queued'] + counts['leased'] == 0:
+                break
+            stop_event.wait(config.QUEUE_POLL_INTERVAL)
+            continue
+
+        started = time.perf_counter()
+        try:
+            result, output = execute_job(translator_app, job)
+        except InvalidJobError as e:
+            queue.fail(job, str(e), retry=False)
+            print(f"❌ [{name}] Job {job.id} ({job.kind}) is invalid: {e}")
+            continue
+        except Exception as e:
+            queue.fail(job, str(e))
+            print(f"❌ [{name}] Job {job.id} ({job.kind}) failed on attempt {job.attempts}: {e}")
+            continue
+
+        result['worker'] = name
+        result['service_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        if queue.ack(job, result, output):
+            print(f"✓ [{name}] Job {job.id} ({job.kind}) done in {result['service_ms']:.0f} ms")
+        else:
+            print(f"⚠️  [{name}] Job {job.id} lease expired before it finished; result discarded")
+
+    print(f"✓ Worker {name} stopped")
+
+
+def submit(queue, lines):
+    """Enqueue JSON-lines jobs and print their ids"""
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+            kind = payload.pop('kind', None) or payload.pop('action', 'translate')
+            kind = ACTION_KINDS.get(kind, kind)
+            if kind not in KINDS:
+                raise ValueError(f"unknown job kind '{kind}'")
+            data = None
+            if 'audio_path' in payload:
+                with open(payload.pop('audio_path'), 'rb') as f:
+                    data = f.read()
+            record = {'line': line_number, 'job_id': queue.enqueue(kind, payload, data)}
+        except Exception as e:
+            record = {'line': line_number, 'error': str(e)}
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+def print_results(queue, audio_dir, follow=False):
+    """Print finished jobs as JSON lines, writing returned audio to audio_dir"""
+    os.makedirs(audio_dir, exist_ok=True)
+    while True:
+        queue.purge()
+        jobs = queue.collect()
+        for job in jobs:
+            output = job.pop('output')
+            if output:
+                result = job['result'] or {}
+                job['audio'] = os.path.join(audio_dir, f"job_{job['id']}.{result.get('format', 'mp3')}")
+                with open(job['audio'], 'wb') as f:
+                    f.write(output)
+            if job['finished_at']:
+                job['latency_ms'] = round((job['finished_at'] - job['created_at']) * 1000, 2)
+            print(json.dumps(job, ensure_ascii=False), flush=True)
+        if not jobs:
+            if not follow:
+                return
+            time.sleep(config.QUEUE_POLL_INTERVAL)
+
+
+def print_metrics(queue):
+    metrics = queue.metrics()
+    counts = metrics['counts']
+    print(f"📊 Queue: {counts['queued']} queued, {counts['leased']} in progress, "
+          f"{counts['done']} done, {counts['failed']} failed", file=sys.stderr)
+    print(f"   Last {metrics['window_seconds']}s: {metrics['throughput_per_second']:.2f} jobs/s, "
+          f"avg latency {metrics['avg_latency_ms']:.0f} ms, "
+          f"avg service {metrics['avg_service_ms']:.0f} ms", file=sys.stderr)
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--queue', default='jobs.db',
+                        help="queue database path or broker URL (default: jobs.db)")
+    parser = argparse.ArgumentParser(description="Queue-backed Voice Translator workers")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit_parser = commands.add_parser('submit', parents=[common], help="enqueue JSON-lines jobs")
+    submit_parser.add_argument('input', nargs='?', default='-', help="job file (default: stdin)")
+
+    run_parser = commands.add_parser('run', parents=[common], help="start worker processes")
+    run_parser.add_argument('-n', '--workers', type=int, default=multiprocessing.cpu_count())
+    run_parser.add_argument('--visibility-timeout', type=float, default=config.QUEUE_VISIBILITY_TIMEOUT,
+                            help="seconds before an unacknowledged job is redelivered")
+    run_parser.add_argument('--until-empty', action='store_true',
+                            help="exit once no jobs are queued or in progress")
+
+    results_parser = commands.add_parser('results', parents=[common], help="print finished jobs")
+    results_parser.add_argument('--audio-dir', default='audio_files')
+    results_parser.add_argument('--follow', action='store_true', help="keep waiting for results")
+
+    commands.add_parser('stats', parents=[common], help="show queue depth and throughput")
+    args = parser.parse_args(argv)
+
+    queue = open_queue(args.queue)
+
+    if args.command == 'submit':
+        if args.input == '-':
+            submit(queue, sys.stdin)
+        else:
+            with open(args.input, encoding='utf-8') as f:
+                submit(queue, f)
+
+    elif args.command == 'run':
+        stop_event = multiprocessing.Event()
+        host = socket.gethostname()
+        processes = [
+            multiprocessing.Process(
+                target=worker_loop,
+                args=(args.queue, f"{host}-{os.getpid()}-{index}", args.visibility_timeout, stop_event, args.until_empty),
+            )
+            for index in range(args.workers)
+        ]
+        # Children start with SIGINT ignored so Ctrl-C can't interrupt them mid-job
+        handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for process in processes:
+            process.start()
+        signal.signal(signal.SIGINT, handler)
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            print("\nStopping workers...", file=sys.stderr)
+            stop_event.set()
+            for process in processes:
+                process.join()
+        print_metrics(queue)
+
+    elif args.command == 'results':
+        print_results(queue, args.audio_dir, follow=args.follow)
+
+    elif args.command == 'stats':
+        print_metrics(queue)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())